@@ -28,7 +28,9 @@ __all__ = ['df_sources',
            'retrieve_any_from_df',
            'retrieve_from_df',
            'list_available_methods_from_df_dict',
-           'list_available_methods_from_df']
+           'list_available_methods_from_df',
+           'df_to_dict_of_dicts',
+           'df_column_to_dict']
 
 import os
 from math import isnan, nan
@@ -185,6 +187,12 @@ def retrieve_any_from_df(df, index, keys):
             except: # pragma: no cover
                 return value
 
+def is_missing_value(value):
+    try:
+        return isnan(value)
+    except TypeError: # Not a number
+        return value is None
+
 def get_value_from_df(df, index, key):
     value = df.at[index, key]
     try:
@@ -209,10 +217,41 @@ def list_available_methods_from_df_dict(df_dict, index, key):
 def list_available_methods_from_df(df, index, keys_by_method):
     if index in df.index:
         return [method for method, key in keys_by_method.items()
-                if not pd.isnull(df.at[index, key])]
+                if not is_missing_value(df.at[index, key])]
     else:
         return []
 
+def df_to_dict_of_dicts(df, keys):
+    '''Convert the `keys` columns of a DataFrame into a dictionary of
+    dictionaries, {index: {key: value}}, for fast lookups. Missing values
+    are not stored, and rows without any values are omitted. Values in
+    numeric columns are converted to floats; other values are kept as-is.
+    '''
+    rows = {}
+    index = df.index.tolist()
+    for key in keys:
+        column = df[key]
+        numeric = column.dtype.kind in 'fiu'
+        for i, value in zip(index, column.tolist()):
+            if numeric:
+                if isnan(value):
+                    continue
+                value = float(value)
+            elif value is None or (type(value) is float and isnan(value)):
+                continue
+            try:
+                rows[i][key] = value
+            except KeyError:
+                rows[i] = {key: value}
+    return rows
+
+def df_column_to_dict(df, key):
+    '''Convert a numeric column of a DataFrame into a dictionary, {index:
+    value}, of floats; missing values are not stored.
+    '''
+    return {i: float(value) for i, value in zip(df.index.tolist(), df[key].tolist())
+            if not isnan(value)}
+
 ### Database
 
 try:
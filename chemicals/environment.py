@@ -34,38 +34,42 @@ Global Warming Potential
 ------------------------
 .. autofunction:: chemicals.environment.GWP
 .. autofunction:: chemicals.environment.GWP_methods
+.. autofunction:: chemicals.environment.GWP_many
 .. autodata:: chemicals.environment.GWP_all_methods
 
 Ozone Depletion Potential
 -------------------------
 .. autofunction:: chemicals.environment.ODP
 .. autofunction:: chemicals.environment.ODP_methods
+.. autofunction:: chemicals.environment.ODP_many
 .. autodata:: chemicals.environment.ODP_all_methods
 
 Octanol-Water Partition Coefficient
 -----------------------------------
 .. autofunction:: chemicals.environment.logP
 .. autofunction:: chemicals.environment.logP_methods
+.. autofunction:: chemicals.environment.logP_many
 .. autodata:: chemicals.environment.logP_all_methods
 
 """
 
 __all__ = ['GWP', 'ODP', 'logP',
            'GWP_all_methods', 'ODP_all_methods', 'logP_all_methods',
-           'GWP_methods', 'ODP_methods', 'logP_methods']
+           'GWP_methods', 'ODP_methods', 'logP_methods',
+           'GWP_many', 'ODP_many', 'logP_many']
+from fluids.numerics import numpy as np
+
 from chemicals import data_reader as dr
 from chemicals import miscdata
 from chemicals.data_reader import (
     data_source,
     database_constant_lookup,
-    list_available_methods_from_df,
-    list_available_methods_from_df_dict,
+    df_column_to_dict,
+    df_to_dict_of_dicts,
     register_df_source,
-    retrieve_any_from_df,
-    retrieve_any_from_df_dict,
     retrieve_from_df,
-    retrieve_from_df_dict,
 )
+from chemicals.identifiers import CAS_to_int
 from chemicals.utils import PY37, can_load_data, mark_numba_incompatible, os_path_join, source_path
 
 ### Register data sources and lazy load them
@@ -73,9 +77,10 @@ folder = os_path_join(source_path, 'Environment')
 register_df_source(folder, 'Official Global Warming Potentials 2007.tsv')
 register_df_source(folder, 'Official Global Warming Potentials 2014.tsv')
 register_df_source(folder, 'Ozone Depletion Potentials.tsv')
-register_df_source(folder, 'CRC logP table.tsv')
+register_df_source(folder, 'CRC logP table.tsv',
+                   csv_kwargs={'dtype': {'logP': float}})
 register_df_source(folder, 'Syrres logP data.csv.gz',
-                   csv_kwargs={'compression': 'gzip'})
+                   csv_kwargs={'compression': 'gzip', 'dtype': {'logP': float}})
 
 IPCC_2007_100YR_GWP = 'IPCC (2007) 100yr'
 IPCC_1995_100YR_GWP = 'IPCC (1995) 100yr'
@@ -90,51 +95,72 @@ GWP_all_methods = (IPCC_2014_100YR_GWP, IPCC_2014_20YR_GWP,
                    IPCC_1995_100YR_GWP)
 """Tuple of method name keys. See the `GWP` for the actual references"""
 
+_IPCC_2007_GWP_keys_by_method = {
+    IPCC_2007_20YR_GWP: '20yr GWP',
+    IPCC_2007_100YR_GWP : '100yr GWP',
+    IPCC_1995_100YR_GWP: 'SAR 100yr',
+    IPCC_2007_500YR_GWP: '500yr GWP',
+}
+_IPCC_2014_GWP_keys_by_method = {
+    IPCC_2014_20YR_GWP : '20yr GWP',
+    IPCC_2014_100YR_GWP: '100yr GWP',
+}
+# Column orders used when no method is specified
+_IPCC_2007_GWP_default_keys = tuple(_IPCC_2007_GWP_keys_by_method.values())
+_IPCC_2014_GWP_default_keys = tuple(_IPCC_2014_GWP_keys_by_method.values())
+
+
+# Available methods by CASRN, filled in as chemicals are queried; only
+# chemicals with data are stored so the caches are bounded by the tables
+_GWP_methods_cache = {}
+_ODP_methods_cache = {}
+_logP_methods_cache = {}
 
 _GWP_ODP_data_loaded = False
 @mark_numba_incompatible
 def _load_GWP_ODP_data():
     global _GWP_ODP_data_loaded, IPCC_2007_GWPs, IPCC_2014_GWPs, ODP_data
-    global _IPCC_2007_GWP_keys_by_method, _IPCC_2014_GWP_keys_by_method, _ODP_keys_by_method
+    global _IPCC_2007_GWP_rows, _IPCC_2014_GWP_rows, _ODP_rows
+    global _GWP_default_values, _ODP_default_values
+    if _GWP_ODP_data_loaded: return
     IPCC_2007_GWPs = data_source('Official Global Warming Potentials 2007.tsv')
     IPCC_2014_GWPs = data_source('Official Global Warming Potentials 2014.tsv')
 
     ODP_data = data_source('Ozone Depletion Potentials.tsv')
+    # {CASRN: {column: value}} with only the available values stored
+    _IPCC_2007_GWP_rows = df_to_dict_of_dicts(IPCC_2007_GWPs, _IPCC_2007_GWP_default_keys)
+    _IPCC_2014_GWP_rows = df_to_dict_of_dicts(IPCC_2014_GWPs, _IPCC_2014_GWP_default_keys)
+    _ODP_rows = df_to_dict_of_dicts(ODP_data, _ODP_default_keys)
+    # Value returned when no method is specified, by CASRN
+    _GWP_default_values = {CASRN: row[next(k for k in _IPCC_2014_GWP_default_keys if k in row)]
+                           for CASRN, row in _IPCC_2014_GWP_rows.items()}
+    _ODP_default_values = {CASRN: row[next(k for k in _ODP_default_keys if k in row)]
+                           for CASRN, row in _ODP_rows.items()}
     _GWP_ODP_data_loaded = True
-    _IPCC_2007_GWP_keys_by_method = {
-        IPCC_2007_20YR_GWP: '20yr GWP',
-        IPCC_2007_100YR_GWP : '100yr GWP',
-        IPCC_1995_100YR_GWP: 'SAR 100yr',
-        IPCC_2007_500YR_GWP: '500yr GWP',
-    }
-    _IPCC_2014_GWP_keys_by_method = {
-        IPCC_2014_20YR_GWP : '20yr GWP',
-        IPCC_2014_100YR_GWP: '100yr GWP',
-    }
-
-    _ODP_keys_by_method = {
-        'ODP2 Max': 'ODP2 Max',
-        'ODP1 Max': 'ODP1 Max',
-        'ODP2 logarithmic average': 'ODP2 Design',
-        'ODP1 logarithmic average': 'ODP1 Design',
-        'ODP2 Min': 'ODP2 Min',
-        'ODP1 Min': 'ODP1 Min',
-        'ODP2 string': 'ODP2',
-        'ODP1 string': 'ODP1',
-    }
 
 _logP_data_loaded = False
 @mark_numba_incompatible
 def _load_logP_data():
-    global _logP_data_loaded, logP_data_CRC, logP_data_Syrres, logP_sources
+    global _logP_data_loaded, logP_data_CRC, logP_data_Syrres, logP_sources, _logP_values_by_method
+    global _logP_default_values
+    if _logP_data_loaded: return
     logP_data_CRC = data_source('CRC logP table.tsv')
     logP_data_Syrres = data_source('Syrres logP data.csv.gz')
-    _logP_data_loaded = True
     logP_sources = {
         'CRC': logP_data_CRC,
         'SYRRES': logP_data_Syrres,
         miscdata.WIKIDATA: miscdata.wikidata_data
     }
+    # A single value per chemical is stored, so use flat {CASRN: logP} dicts
+    _logP_values_by_method = {
+        CRC: df_column_to_dict(logP_data_CRC, 'logP'),
+        SYRRES: df_column_to_dict(logP_data_Syrres, 'logP'),
+    }
+    # Value returned when no method is specified, by CASRN; CRC data takes
+    # precedence over Syrres data
+    _logP_default_values = _logP_values_by_method[SYRRES].copy()
+    _logP_default_values.update(_logP_values_by_method[CRC])
+    _logP_data_loaded = True
 
 if PY37:
     def __getattr__(name):
@@ -151,6 +177,27 @@ else:  # pragma: no cover
         _load_logP_data()
 
 
+def _first_values_from_df(df, index, keys):
+    # Values of the first column in `keys` with data for each of `index`;
+    # NaN where no column has data
+    df = df.reindex(index)
+    values = df[keys[0]].to_numpy(dtype=float)
+    for key in keys[1:]:
+        missing = np.isnan(values)
+        if not missing.any():
+            break
+        values[missing] = df[key].to_numpy(dtype=float)[missing]
+    return values
+
+def _int_CASRNs(CASRNs):
+    int_CASRNs = []
+    for CASRN in CASRNs:
+        try:
+            int_CASRNs.append(CAS_to_int(CASRN))
+        except (ValueError, TypeError, AttributeError):
+            int_CASRNs.append(-1)
+    return int_CASRNs
+
 ### Environmental data functions
 
 @mark_numba_incompatible
@@ -171,10 +218,18 @@ def GWP_methods(CASRN):
     --------
     GWP
     """
+    try:
+        return list(_GWP_methods_cache[CASRN])
+    except KeyError:
+        pass
     if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
-    methods_4e = list_available_methods_from_df(IPCC_2007_GWPs, CASRN, _IPCC_2007_GWP_keys_by_method)
-    methods_5e = list_available_methods_from_df(IPCC_2014_GWPs, CASRN, _IPCC_2014_GWP_keys_by_method)
-    return methods_4e + methods_5e
+    row = _IPCC_2007_GWP_rows.get(CASRN, ())
+    methods = [method for method, key in _IPCC_2007_GWP_keys_by_method.items() if key in row]
+    row = _IPCC_2014_GWP_rows.get(CASRN, ())
+    methods.extend([method for method, key in _IPCC_2014_GWP_keys_by_method.items() if key in row])
+    if methods:
+        _GWP_methods_cache[CASRN] = tuple(methods)
+    return methods
 
 
 @mark_numba_incompatible
@@ -253,24 +308,65 @@ def GWP(CASRN, method=None):
        Other Weak Atmospheric Absorbers." Reviews of Geophysics 58, no. 3
        (2020): e2019RG000691. https://doi.org/10.1029/2019RG000691.
     '''
-    if dr.USE_CONSTANTS_DATABASE and method is None:
-        val, found = database_constant_lookup(CASRN, 'GWP')
-        if found: return val
+    if method is None:
+        if dr.USE_CONSTANTS_DATABASE:
+            val, found = database_constant_lookup(CASRN, 'GWP')
+            if found: return val
+        if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
+        return _GWP_default_values.get(CASRN)
+    if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
+    if method in _IPCC_2014_GWP_keys_by_method:
+        key, rows = _IPCC_2014_GWP_keys_by_method[method], _IPCC_2014_GWP_rows
+    elif method in _IPCC_2007_GWP_keys_by_method:
+        key, rows = _IPCC_2007_GWP_keys_by_method[method], _IPCC_2007_GWP_rows
+    else:
+        raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+                method, list(GWP_all_methods)))
+    row = rows.get(CASRN)
+    return None if row is None else row.get(key)
+
+@mark_numba_incompatible
+def GWP_many(CASRNs, method=None):
+    r'''Retrieve the Global Warming Potential of many chemicals at once. The
+    data selected is the same as that returned by :obj:`GWP`, but the
+    lookup is performed with a single pass over the data tables.
+
+    Parameters
+    ----------
+    CASRNs : list[str]
+        CASRNs [-]
+
+    Returns
+    -------
+    GWPs : ndarray
+        Global warming potentials, NaN where no data is available,
+        [(impact/mass chemical)/(impact/mass CO2)]
+
+    Other Parameters
+    ----------------
+    method : string, optional
+        The method name to use; see :obj:`GWP`.
+
+    Examples
+    --------
+    >>> GWP_many(['74-82-8', '7732-18-5'], method='IPCC (2014) 100yr')
+    array([28., nan])
+
+    See Also
+    --------
+    GWP
+    '''
     if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
     if method:
         if method in _IPCC_2014_GWP_keys_by_method:
-            key, df = _IPCC_2014_GWP_keys_by_method[method], IPCC_2014_GWPs
+            keys, df = (_IPCC_2014_GWP_keys_by_method[method],), IPCC_2014_GWPs
         elif method in _IPCC_2007_GWP_keys_by_method:
-            key, df = _IPCC_2007_GWP_keys_by_method[method], IPCC_2007_GWPs
-        return retrieve_from_df(df, CASRN, key)
-    else:
-        try:
-            return retrieve_any_from_df(IPCC_2014_GWPs, CASRN, _IPCC_2014_GWP_keys_by_method.values())
-        except:
-            try:
-                return retrieve_any_from_df(IPCC_2007_GWPs, CASRN, _IPCC_2007_GWP_keys_by_method.values())
-            except:
-                return None
+            keys, df = (_IPCC_2007_GWP_keys_by_method[method],), IPCC_2007_GWPs
+        else:
+            raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+                    method, list(GWP_all_methods)))
+        return _first_values_from_df(df, CASRNs, keys)
+    return _first_values_from_df(IPCC_2014_GWPs, CASRNs, _IPCC_2014_GWP_default_keys)
 
 ### Ozone Depletion Potentials
 
@@ -286,6 +382,18 @@ ODP_all_methods = (ODP2MAX, ODP1MAX, ODP2LOG, ODP1LOG,
                    ODP2MIN, ODP1MIN, ODP2STR, ODP1STR)
 """Tuple of method name keys. See the `ODP` for the actual references"""
 
+_ODP_keys_by_method = {
+    ODP2MAX: 'ODP2 Max',
+    ODP1MAX: 'ODP1 Max',
+    ODP2LOG: 'ODP2 Design',
+    ODP1LOG: 'ODP1 Design',
+    ODP2MIN: 'ODP2 Min',
+    ODP1MIN: 'ODP1 Min',
+    ODP2STR: 'ODP2',
+    ODP1STR: 'ODP1',
+}
+_ODP_default_keys = tuple(_ODP_keys_by_method.values())
+
 @mark_numba_incompatible
 def ODP_methods(CASRN):
     """Return all methods available to obtain ODP for the desired chemical.
@@ -304,8 +412,16 @@ def ODP_methods(CASRN):
     --------
     ODP
     """
+    try:
+        return list(_ODP_methods_cache[CASRN])
+    except KeyError:
+        pass
     if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
-    return list_available_methods_from_df(ODP_data, CASRN, _ODP_keys_by_method)
+    row = _ODP_rows.get(CASRN, ())
+    methods = [method for method, key in _ODP_keys_by_method.items() if key in row]
+    if methods:
+        _ODP_methods_cache[CASRN] = tuple(methods)
+    return methods
 
 @mark_numba_incompatible
 def ODP(CASRN, method=None):
@@ -370,15 +486,64 @@ def ODP(CASRN, method=None):
        Project-Report No. 52, Geneva, Switzerland, 516 p.
        https://www.wmo.int/pages/prog/arep/gaw/ozone_2010/documents/Ozone-Assessment-2010-complete.pdf
     '''
-    if dr.USE_CONSTANTS_DATABASE and method is None:
-        val, found = database_constant_lookup(CASRN, 'ODP')
-        if found: return val
+    if method is None:
+        if dr.USE_CONSTANTS_DATABASE:
+            val, found = database_constant_lookup(CASRN, 'ODP')
+            if found: return val
+        if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
+        return _ODP_default_values.get(CASRN)
     if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
-    if method:
+    try:
         key = _ODP_keys_by_method[method]
-        return retrieve_from_df(ODP_data, CASRN, key)
+    except KeyError:
+        raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+                method, list(ODP_all_methods)))
+    row = _ODP_rows.get(CASRN)
+    return None if row is None else row.get(key)
+
+@mark_numba_incompatible
+def ODP_many(CASRNs, method=None):
+    r'''Retrieve the Ozone Depletion Potential of many chemicals at once. The
+    data selected is the same as that returned by :obj:`ODP`, but the
+    lookup is performed with a single pass over the data table. Only the
+    numerical methods are supported.
+
+    Parameters
+    ----------
+    CASRNs : list[str]
+        CASRNs [-]
+
+    Returns
+    -------
+    ODPs : ndarray
+        Ozone Depletion potentials, NaN where no data is available,
+        [(impact/mass chemical)/(impact/mass CFC-11)]
+
+    Other Parameters
+    ----------------
+    method : string, optional
+        The method name to use; see :obj:`ODP`. The `string` methods are not
+        accepted.
+
+    Examples
+    --------
+    >>> ODP_many(['76-14-2', '460-86-6', '7732-18-5'])
+    array([0.58, 7.5 ,  nan])
+
+    See Also
+    --------
+    ODP
+    '''
+    if not _GWP_ODP_data_loaded: _load_GWP_ODP_data()
+    if method:
+        if method not in _ODP_keys_by_method or method in (ODP2STR, ODP1STR):
+            raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+                    method, list(ODP_all_methods[:-2])))
+        keys = (_ODP_keys_by_method[method],)
     else:
-        return retrieve_any_from_df(ODP_data, CASRN, _ODP_keys_by_method.values())
+        # Every chemical with a string value also has a numerical one
+        keys = _ODP_default_keys[:-2]
+    return _first_values_from_df(ODP_data, CASRNs, keys)
 
 ### log P
 
@@ -405,8 +570,17 @@ def logP_methods(CASRN):
     --------
     logP
     """
+    try:
+        return list(_logP_methods_cache[CASRN])
+    except KeyError:
+        pass
     if not _logP_data_loaded: _load_logP_data()
-    return list_available_methods_from_df_dict(logP_sources, CASRN, 'logP')
+    methods = [method for method, values in _logP_values_by_method.items() if CASRN in values]
+    if retrieve_from_df(miscdata.wikidata_data, CASRN, 'logP') is not None:
+        methods.append(miscdata.WIKIDATA)
+    if methods:
+        _logP_methods_cache[CASRN] = tuple(methods)
+    return methods
 
 @mark_numba_incompatible
 def logP(CASRN, method=None):
@@ -455,11 +629,70 @@ def logP(CASRN, method=None):
     .. [2] Haynes, W.M., Thomas J. Bruno, and David R. Lide. CRC Handbook of
        Chemistry and Physics, 95E. Boca Raton, FL: CRC press, 2014.
     '''
-    if dr.USE_CONSTANTS_DATABASE and method is None:
-        val, found = database_constant_lookup(CASRN, 'logP')
-        if found: return val
+    if method is None:
+        if dr.USE_CONSTANTS_DATABASE:
+            val, found = database_constant_lookup(CASRN, 'logP')
+            if found: return val
+        if not _logP_data_loaded: _load_logP_data()
+        val = _logP_default_values.get(CASRN)
+        if val is not None: return val
+        return retrieve_from_df(miscdata.wikidata_data, CASRN, 'logP')
+    if not _logP_data_loaded: _load_logP_data()
+    if method in _logP_values_by_method:
+        return _logP_values_by_method[method].get(CASRN)
+    elif method == miscdata.WIKIDATA:
+        return retrieve_from_df(miscdata.wikidata_data, CASRN, 'logP')
+    raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+            method, list(logP_sources)))
+
+@mark_numba_incompatible
+def logP_many(CASRNs, method=None):
+    r'''Retrieve the octanol-water partition coefficient of many chemicals at
+    once. The data selected is the same as that returned by :obj:`logP`, but
+    the lookup is performed with a single pass over each data table.
+
+    Parameters
+    ----------
+    CASRNs : list[str]
+        CASRNs [-]
+
+    Returns
+    -------
+    logPs : ndarray
+        Octanol-water partition coefficients, NaN where no data is
+        available, [-]
+
+    Other Parameters
+    ----------------
+    method : string, optional
+        The method name to use; see :obj:`logP`.
+
+    Examples
+    --------
+    >>> logP_many(['67-56-1', '124-18-5', '1124321250-54-3'])
+    array([-0.74,  6.25,   nan])
+
+    See Also
+    --------
+    logP
+    '''
     if not _logP_data_loaded: _load_logP_data()
     if method:
-        return retrieve_from_df_dict(logP_sources, CASRN, 'logP', method)
+        if method not in logP_sources:
+            raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+                    method, list(logP_sources)))
+        methods = (method,)
     else:
-        return retrieve_any_from_df_dict(logP_sources, CASRN, 'logP')
+        methods = tuple(logP_sources)
+    values = None
+    for method in methods:
+        df = logP_sources[method]
+        index = _int_CASRNs(CASRNs) if df.index.dtype is dr.int64_dtype else CASRNs
+        if values is None:
+            values = _first_values_from_df(df, index, ('logP',))
+        else:
+            missing = np.isnan(values)
+            if not missing.any():
+                break
+            values[missing] = _first_values_from_df(df, index, ('logP',))[missing]
+    return values
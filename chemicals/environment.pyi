@@ -1,5 +1,6 @@
 # DO NOT EDIT - AUTOMATICALLY GENERATED BY tests/make_test_stubs.py!
 from typing import List
+from numpy import ndarray
 from pandas.core.frame import DataFrame
 from typing import (
     List,
@@ -11,12 +12,18 @@ from typing import (
 def GWP(CASRN: str, method: Optional[str] = ...) -> Optional[float]: ...
 
 
+def GWP_many(CASRNs: List[str], method: Optional[str] = ...) -> ndarray: ...
+
+
 def GWP_methods(CASRN: str) -> List[str]: ...
 
 
 def ODP(CASRN: str, method: Optional[str] = ...) -> Optional[Union[str, float]]: ...
 
 
+def ODP_many(CASRNs: List[str], method: Optional[str] = ...) -> ndarray: ...
+
+
 def ODP_methods(CASRN: str) -> List[str]: ...
 
 
@@ -32,6 +39,9 @@ def _load_logP_data() -> None: ...
 def logP(CASRN: str, method: Optional[str] = ...) -> Optional[float]: ...
 
 
+def logP_many(CASRNs: List[str], method: Optional[str] = ...) -> ndarray: ...
+
+
 def logP_methods(CASRN: str) -> List[str]: ...
 
 __all__: List[str]
\ No newline at end of file
@@ -41,12 +41,15 @@ to_change = ['utils.zs_to_ws', 'utils.ws_to_zs', 'utils.zs_to_Vfs',
      'rachford_rice.Rachford_Rice_polynomial_3',
      'rachford_rice.Rachford_Rice_polynomial_4',
      'rachford_rice.Rachford_Rice_polynomial_5',
+     'rachford_rice.Rachford_Rice_polynomial_6',
      'rachford_rice.Rachford_Rice_solution_polynomial',
      'rachford_rice.Rachford_Rice_numpy_err_fprime2',
      'rachford_rice.Rachford_Rice_solution_Leibovici_Neoschil',
      'rachford_rice.Rachford_Rice_solution_Leibovici_Neoschil_dd',
      'rachford_rice.Li_Johns_Ahmadi_solution',
      'rachford_rice._Rachford_Rice_analytical_3',
+     'rachford_rice._rr_binary',
+     'rachford_rice._raise_phase_count_reduced',
      'rachford_rice.flash_inner_loop',
      'rachford_rice.Rachford_Rice_solution2',
      'rachford_rice.Rachford_Rice_solutionN',
@@ -43,6 +43,7 @@ Two Phase - Implementations
 .. autofunction:: chemicals.rachford_rice.Li_Johns_Ahmadi_solution
 .. autofunction:: chemicals.rachford_rice.Rachford_Rice_solution_Leibovici_Neoschil
 .. autofunction:: chemicals.rachford_rice.Rachford_Rice_solution_polynomial
+.. autofunction:: chemicals.rachford_rice.Rachford_Rice_solution_batch
 
 Two Phase - High-Precision Implementations
 ------------------------------------------
@@ -130,12 +131,15 @@ __all__ = ['Rachford_Rice_flash_error',
            'flash_inner_loop_all_methods', 'flash_inner_loop_methods',
            'Rachford_Rice_solution_mpmath', 'Rachford_Rice_solution_binary_dd',
            'Rachford_Rice_solution_Leibovici_Neoschil',
-           'Rachford_Rice_solution_Leibovici_Neoschil_dd']
+           'Rachford_Rice_solution_Leibovici_Neoschil_dd',
+           'Rachford_Rice_solution_batch']
 
 from fluids.numerics import (
     IS_PYPY,
+    UnconvergedError,
     add_dd,
     brenth,
+    copysign,
     div_dd,
     exp,
     gt_dd,
@@ -159,16 +163,12 @@ from fluids.numerics import (
     solve_2_direct,
     solve_3_direct,
     solve_4_direct,
+    sqrt,
 )
 from fluids.numerics import numpy as np
 
 from chemicals.exceptions import PhaseCountReducedError
-from chemicals.utils import mark_numba_incompatible, mark_numba_uncacheable
-
-try:
-    from itertools import combinations
-except:
-    pass
+from chemicals.utils import mark_numba_incompatible, mark_numba_uncacheable, ndarray
 
 
 def Rachford_Rice_polynomial_3(zs, Cs):
@@ -244,96 +244,65 @@ def Rachford_Rice_polynomial_5(zs, Cs):
     x32 = C3*x6
     x33 = C2*x9
     x34 = C2*x12
+    x35 = x2 + x5 + x8
+    x36 = x11 + x15 + x16 + x18 + x19 + x20 + x23 + x25 + x27
     a_inv = 1.0/(C0*C1*C2*C3*C4*(z0 + z1 + z2 + z3 + z4))
-    b = (C2*x11 + C2*x14 + C3*x14 + C3*x2 + C3*x21 + C3*x29 + C3*x5 + C3*x8
-         + C4*x11 + C4*x15 + C4*x16 + C4*x18 + C4*x19 + C4*x2 + C4*x20 + C4*x23
-         + C4*x25 + C4*x27 + C4*x5 + C4*x8)*a_inv
-    c = (C3*x13 + C3*x28 + C3*x34 + C4*x1 + C4*x10 + C4*x17 + C4*x22 + C4*x24
-         + C4*x26 + C4*x30 + C4*x31 + C4*x32 + C4*x33 + C4*x4 + C4*x7 + x11
-         + x14 + x15 + x16 + x18 + x19 + x2 + x20 + x21 + x23 + x25 + x27
-         + x29 + x5 + x8)*a_inv
-    d = (C3*x12 + C4*x0 + C4*x3 + C4*x6 + C4*x9 + x1 + x10 + x13 + x17 + x22
+    b = (C2*(x11 + x14) + C3*(x14 + x21 + x29 + x35)
+         + C4*(x36 + x35))*a_inv
+    c = (C3*(x13 + x28 + x34) + C4*(x1 + x10 + x17 + x22 + x24 + x26 + x30
+         + x31 + x32 + x33 + x4 + x7) + x14 + x36 + x21 + x29
+         + x35)*a_inv
+    d = (C3*x12 + C4*(x0 + x3 + x6 + x9) + x1 + x10 + x13 + x17 + x22
          + x24 + x26 + x28 + x30 + x31 + x32 + x33 + x34 + x4 + x7)*a_inv
     e = (x0 + x12 + x3 + x6 + x9)*a_inv
     return [1.0, b, c, d, e]
 
 
-# _RR_poly_idx_cache = {}
-def _Rachford_Rice_polynomial_coeff(value, zs, Cs, N):
-#     global_list = []
-#     # This part can be cached, so its performance implication is small
-#     # I believe for high-N, this is causing out of memory errors
-#     # However, even when using yield, still out-of-memories
-#     def better_recurse(prev_value, max_value, working=None):
-#         if working is None:
-#             working = []
-#         for i in range(prev_value, max_value):
-#             if N == max_value:
-# #                yield working + [i]
-# #                return
-#                 global_list.append(working + [i])
-#             else:
-#                 better_recurse(i + 1, max_value + 1, working + [i])
-# #        return global_list
-#
-#     if (value, N) in _RR_poly_idx_cache:
-#         global_list = _RR_poly_idx_cache[(value, N)]
-#     else:
-#         better_recurse(0, value)
-#         _RR_poly_idx_cache[(value, N)] = global_list
-#
-#     zs_sum_mat = []
-#     Cs_inv_mat = []
-#     for i in range(N):
-#         Cs_inv_list = []
-#         zs_sum_list = []
-#         for j in range(N):
-#             if j > i:
-#                 Cs_inv_list.append(None)
-#                 zs_sum_list.append(None)
-#             else:
-#                 Cs_inv_list.append(Cs[i]*Cs[j])
-#                 zs_sum_list.append(zs[i] + zs[j])
-#         Cs_inv_mat.append(Cs_inv_list)
-#         zs_sum_mat.append(zs_sum_list)
-#     print(Cs_inv_mat)
-#     Cs_inv_mat = [[Ci*Cj for Cj in Cs] for Ci in Cs]
-#     zs_sum_mat = [[zi + zj for zj in zs] for zi in zs]
-
-    # If there were some way to use cse this might work much faster
-    # c = 0.0
-    # for x in range(N):
-    #     for y in range(x):
-    #         c += (1.0 - zs[x] - zs[y])*(Cs[x]*Cs[y])
-    # return c
-
-
-    c = 0.0
-
-    for idxs in combinations(list(range(N)), 1+N-value):
-    #for idxs in global_list:
-        C_msum = 1.0
-        z_tot = 1.0
-        for i in idxs:
-            z_tot -= zs[i]
-            C_msum *= Cs[i]
-#         print(z_tot, C_msum, idxs)
-#         C_msum = 1.0
-#         z_tot = 1.0
-#         l_idxs = len(idxs)
-# #         # j is always larger than i only need half the matrixes
-#         for i in range(0, l_idxs-1, 2):
-#             i, j = idxs[i], idxs[i+1]
-# #             print(j, i)
-# #             print(j > i)
-#             z_tot -= zs_sum_mat[j][i]
-#             C_msum *= Cs_inv_mat[j][i]
-#         if l_idxs & 1:
-#             j = idxs[-1]
-#             z_tot -= zs[j]
-#             C_msum *= Cs[j]
-        c += z_tot*C_msum
-    return c
+def Rachford_Rice_polynomial_6(zs, Cs):
+    z0, z1, z2, z3, z4, z5 = zs
+    C0, C1, C2, C3, C4, C5 = Cs
+    # The product recurrence of Rachford_Rice_polynomial, unrolled
+    d0 = 1.0/C0
+    d1 = 1.0/C1
+    d2 = 1.0/C2
+    d3 = 1.0/C3
+    d4 = 1.0/C4
+    d5 = 1.0/C5
+    x0 = d1*d0
+    x1 = d1*z0 + z1*d0
+    x2 = d0 + d1
+    x3 = z0 + z1
+    x4 = d2*x0
+    x5 = d2*x1 + z2*x0
+    x6 = x0 + d2*x2
+    x7 = x1 + d2*x3 + z2*x2
+    x8 = x2 + d2
+    x9 = x3 + z2
+    x10 = d3*x4
+    x11 = d3*x5 + z3*x4
+    x12 = x4 + d3*x6
+    x13 = x5 + d3*x7 + z3*x6
+    x14 = x6 + d3*x8
+    x15 = x7 + d3*x9 + z3*x8
+    x16 = x8 + d3
+    x17 = x9 + z3
+    x18 = d4*x10
+    x19 = d4*x11 + z4*x10
+    x20 = x10 + d4*x12
+    x21 = x11 + d4*x13 + z4*x12
+    x22 = x12 + d4*x14
+    x23 = x13 + d4*x15 + z4*x14
+    x24 = x14 + d4*x16
+    x25 = x15 + d4*x17 + z4*x16
+    x26 = x16 + d4
+    x27 = x17 + z4
+    x28 = d5*x19 + z5*x18
+    x29 = x19 + d5*x21 + z5*x20
+    x30 = x21 + d5*x23 + z5*x22
+    x31 = x23 + d5*x25 + z5*x24
+    x32 = x25 + d5*x27 + z5*x26
+    a_inv = 1.0/(x27 + z5)
+    return [1.0, x32*a_inv, x31*a_inv, x30*a_inv, x29*a_inv, x28*a_inv]
 
 
 def Rachford_Rice_polynomial(zs, Ks):
@@ -342,10 +311,6 @@ def Rachford_Rice_polynomial(zs, Ks):
     A spelled-out solution is used for N from 2 to 5, derived with SymPy and
     optimized with the common sub expression approach.
 
-    .. warning:: For large numbers of components (>20) this model performs
-       terribly, though with future optimization it may be possible to have
-       better performance.
-
     .. math::
         \sum_{i=1}^N z_i C_i\left[ \Pi_{j\ne i}^N \left(1 + \frac{V}{F}
         C_j\right)\right] = 0
@@ -437,39 +402,36 @@ def Rachford_Rice_polynomial(zs, Ks):
         return Rachford_Rice_polynomial_4(zs, Cs)
     elif N == 5:
         return Rachford_Rice_polynomial_5(zs, Cs)
-
-    Cs_inv = [0.0]*N
-    for i in range(N):
-        Cs_inv[i] = 1.0/Cs[i]
-    #coeffs = [1.0]
+    elif N == 6:
+        return Rachford_Rice_polynomial_6(zs, Cs)
+
+    # Dividing through by the product of all Cs, the polynomial is
+    # sum_i z_i prod_{j != i} (alpha + 1/C_j). Build it one component at a
+    # time, along with prods = prod_j (alpha + 1/C_j) of the components
+    # added so far; each addition is a polynomial multiply by
+    # (alpha + 1/C_m), so the whole calculation is O(N^2)
     coeffs = [0.0]*N
-    coeffs[0] = 1.0
-
-#    if N > 2:
-    c = 0.0
-    for i in range(0, N):
-        c += (1.0 - zs[i])*Cs_inv[i]
-    coeffs[1] = c
-    #coeffs.append(c)
-    for v, i in zip(range(N - 1, 2, -1), range(2, N-1)):
-        coeffs[i] = _Rachford_Rice_polynomial_coeff(v, zs, Cs_inv, N)
-
-
-    # coeffs.extend([_Rachford_Rice_polynomial_coeff(v, zs, Cs_inv, N)
-    #                 for v in range(N-1, 2, -1)])
-
-    c = 0.0
-    for i in range(0, N):
-        C_sumprod = 1.0
-        for j, C in enumerate(Cs_inv):
-            if j != i:
-                C_sumprod *= C
-        c += zs[i]*C_sumprod
-    coeffs[-1] = c
+    prods = [0.0]*N
+    prods[0] = 1.0
+    for m in range(N):
+        C_inv = 1.0/Cs[m]
+        zm = zs[m]
+        if m + 1 < N:
+            prods[m+1] = C_inv*prods[m]
+        for k in range(m, 0, -1):
+            coeffs[k] += C_inv*coeffs[k-1] + zm*prods[k]
+            prods[k] += C_inv*prods[k-1]
+        coeffs[0] += zm
+    a_inv = 1.0/coeffs[0]
+    for k in range(N):
+        coeffs[k] *= a_inv
     return coeffs
 
 def err_RR_poly(VF, poly):
     return horner(poly, VF)
+def err_RR_poly_6(VF, poly):
+    # Unrolled for the six component case, the smallest one solved iteratively
+    return ((((poly[0]*VF + poly[1])*VF + poly[2])*VF + poly[3])*VF + poly[4])*VF + poly[5]
 def err_and_der_RR_poly(VF, poly):
     return horner_and_der(poly, VF)
 
@@ -486,8 +448,9 @@ def Rachford_Rice_solution_polynomial(zs, Ks):
     .. math::
         \sum_i \frac{z_i(K_i-1)}{1 + \frac{V}{F}(K_i-1)} = 0
 
-    .. warning:: : Using this function with more than 20 components is likely
-       to crash Python! This model does not work well with many components!
+    .. warning:: : The polynomial becomes badly conditioned as the number of
+       components increases; this model does not work well with many
+       components!
 
     This method, developed first in [3]_ and expanded in [1]_, is clever but
     of little use for large numbers of components.
@@ -562,8 +525,7 @@ def Rachford_Rice_solution_polynomial(zs, Ks):
 #        if Ks[i] < Kmin: # numba: uncomment
 #            Kmin = Ks[i] # numba: uncomment
     if Kmin > 1.0 or Kmax < 1.0:
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
 
     V_over_F_min = ((Kmax-Kmin)*z_of_Kmax - (1.- Kmin))/((1.- Kmin)*(Kmax - 1.))
     V_over_F_max = 1./(1.-Kmin)
@@ -585,12 +547,25 @@ def Rachford_Rice_solution_polynomial(zs, Ks):
 
         found = False
         try:
-            V_over_F = secant(err_RR_poly, x0, args=(poly,))
+            if N == 6:
+                V_over_F = secant(err_RR_poly_6, x0, args=(poly,))
+            else:
+                V_over_F = secant(err_RR_poly, x0, args=(poly,))
             found = True
             # V_over_F = secant(err, x0, low=V_over_F_min, high=V_over_F_max, bisection=True)
             # V_over_F = newton(err_and_der, x0, fprime=True, low=V_over_F_min, high=V_over_F_max, bisection=True)
             if V_over_F < V_over_F_min or V_over_F > V_over_F_max:
                 found = False
+            else:
+                # The secant can stall away from the root when the terms of the
+                # polynomial cancel; only accept a point whose residual is
+                # within the rounding error of evaluating the polynomial there
+                err, err_bound, VF_abs = 0.0, 0.0, abs(V_over_F)
+                for c in poly:
+                    err = err*V_over_F + c
+                    err_bound = err_bound*VF_abs + abs(c)
+                if abs(err) > 1e-10*err_bound:
+                    found = False
         except:
             pass
         if not found:
@@ -625,11 +600,32 @@ def Rachford_Rice_solution_polynomial(zs, Ks):
     xs = [0.0]*N
     ys = [0.0]*N
     for i in range(N):
-        xs[i] = zs[i]/(1. + V_over_F*(Ks[i]-1.0))
-        ys[i] = xs[i]*Ks[i]
+        Ki = Ks[i]
+        xi = zs[i]/(1. + V_over_F*(Ki - 1.0))
+        xs[i] = xi
+        ys[i] = xi*Ki
     return V_over_F, xs, ys
 
 
+def _raise_phase_count_reduced(Ks):
+    # The numba line comes first; a trailing comment is not part of the
+    # source the numba wrapper reads
+#    raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+    raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
+
+def _Rachford_Rice_K_bounds(zs, Ks):
+    # Smallest and largest K values of the components present, and the
+    # mole fraction of the component with the largest K value
+    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
+    for i in range(len(Ks)):
+        if zs[i] > 0.0:
+            if Ks[i] > Kmax:
+                z_of_Kmax = zs[i]
+                Kmax = Ks[i]
+            if Ks[i] < Kmin:
+                Kmin = Ks[i]
+    return Kmin, Kmax, z_of_Kmax
+
 def Rachford_Rice_flash_error(V_over_F, zs, Ks):
     r'''Calculates the objective function of the Rachford-Rice flash equation.
     This function should be called by a solver seeking a solution to a flash
@@ -695,23 +691,20 @@ def Rachford_Rice_flash_error(V_over_F, zs, Ks):
 
 def Rachford_Rice_err_fprime(V_over_F, zs_k_minus_1, zs_k_minus_1_2, K_minus_1):
     err0, err1 = 0.0, 0.0
-    for num0, num1, Kim1 in zip(zs_k_minus_1, zs_k_minus_1_2, K_minus_1):
-        VF_kim1_1_inv = 1.0/(1. + V_over_F*Kim1)
-        err0 += num0*VF_kim1_1_inv
-        err1 += num1*VF_kim1_1_inv*VF_kim1_1_inv
-#            print(err0, V_over_F)
+    for i in range(len(K_minus_1)):
+        VF_kim1_1_inv = 1.0/(1. + V_over_F*K_minus_1[i])
+        err0 += zs_k_minus_1[i]*VF_kim1_1_inv
+        err1 += zs_k_minus_1_2[i]*VF_kim1_1_inv*VF_kim1_1_inv
     return err0, err1
 
 def Rachford_Rice_err_fprime2(V_over_F, zs_k_minus_1, zs_k_minus_1_2, zs_k_minus_1_3, K_minus_1):
     err0, err1, err2 = 0.0, 0.0, 0.0
-    for num0, num1, num2, Kim1 in zip(zs_k_minus_1, zs_k_minus_1_2, zs_k_minus_1_3, K_minus_1):
-        VF_kim1_1_inv = 1.0/(1. + V_over_F*Kim1)
+    for i in range(len(K_minus_1)):
+        VF_kim1_1_inv = 1.0/(1. + V_over_F*K_minus_1[i])
         t2 = VF_kim1_1_inv*VF_kim1_1_inv
-        err0 += num0*VF_kim1_1_inv
-        err1 += num1*t2
-        err2 += num2*t2*VF_kim1_1_inv
-#            print(err0, err1, err2)
-    # print(err0, V_over_F)
+        err0 += zs_k_minus_1[i]*VF_kim1_1_inv
+        err1 += zs_k_minus_1_2[i]*t2
+        err2 += zs_k_minus_1_3[i]*t2*VF_kim1_1_inv
     return err0, err1, err2
 
 def Rachford_Rice_err(V_over_F, zs_k_minus_1, K_minus_1):
@@ -722,6 +715,39 @@ def Rachford_Rice_err(V_over_F, zs_k_minus_1, K_minus_1):
 
 
 
+def _Rachford_Rice_solution_closed_form(zs, Ks, V_over_F_min, V_over_F_max):
+    # With the denominators cleared, the objective function is linear in
+    # V/F for two components and quadratic for three. Returns whether a root
+    # was found within the bounds, and the root.
+    N = len(zs)
+    if N == 2:
+        k0, k1 = Ks[0] - 1.0, Ks[1] - 1.0
+        den = (zs[0] + zs[1])*k0*k1
+        if den == 0.0:
+            return False, 0.0
+        V_over_F = -(zs[0]*k0 + zs[1]*k1)/den
+        return V_over_F_min < V_over_F < V_over_F_max, V_over_F
+    # A component with no feed would add a spurious root
+    if zs[0] <= 0.0 or zs[1] <= 0.0 or zs[2] <= 0.0:
+        return False, 0.0
+    k0, k1, k2 = Ks[0] - 1.0, Ks[1] - 1.0, Ks[2] - 1.0
+    t0, t1, t2 = zs[0]*k0, zs[1]*k1, zs[2]*k2
+    a = (zs[0] + zs[1] + zs[2])*k0*k1*k2
+    b = t0*(k1 + k2) + t1*(k0 + k2) + t2*(k0 + k1)
+    c = t0 + t1 + t2
+    disc = b*b - 4.0*a*c
+    if disc < 0.0 or a == 0.0:
+        return False, 0.0
+    q = -0.5*(b + copysign(sqrt(disc), b))
+    if q == 0.0:
+        return False, 0.0
+    V_over_F = q/a
+    if V_over_F_min < V_over_F < V_over_F_max:
+        return True, V_over_F
+    V_over_F = c/q
+    return V_over_F_min < V_over_F < V_over_F_max, V_over_F
+
+
 @mark_numba_uncacheable
 def Rachford_Rice_solution(zs, Ks, fprime=False, fprime2=False, guess=None):
     r'''Solves the objective function of the Rachford-Rice flash equation [1]_.
@@ -776,6 +802,10 @@ def Rachford_Rice_solution(zs, Ks, fprime=False, fprime2=False, guess=None):
     .. math::
         \left(\frac{V}{F}\right)_{max} = \frac{1}{1-K_{min}}
 
+    For two or three components, clearing the denominators leaves a linear
+    or quadratic equation which is solved directly; the iterative solvers
+    are used for more components.
+
     If the `newton` method does not converge, a bisection method (brenth) is
     used instead. However, it is somewhat slower, especially as newton will
     attempt 50 iterations before giving up.
@@ -798,7 +828,7 @@ def Rachford_Rice_solution(zs, Ks, fprime=False, fprime2=False, guess=None):
     Examples
     --------
     >>> Rachford_Rice_solution(zs=[0.5, 0.3, 0.2], Ks=[1.685, 0.742, 0.532])
-    (0.6907302627738544, [0.33940869696634357, 0.3650560590371706, 0.2955352439964858], [0.5719036543882889, 0.27087159580558057, 0.15722474980613044])
+    (0.690730262773854, [0.3394086969663436, 0.36505605903717053, 0.29553524399648573], [0.571903654388289, 0.2708715958055805, 0.1572247498061304])
 
     References
     ----------
@@ -817,20 +847,25 @@ def Rachford_Rice_solution(zs, Ks, fprime=False, fprime2=False, guess=None):
     '''
     N = len(Ks)
 
-    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
-    for i in range(N):
-        if zs[i] > 0.0:
-            if Ks[i] > Kmax:
-                z_of_Kmax = zs[i]
-                Kmax = Ks[i]
-            if Ks[i] < Kmin:
-                Kmin = Ks[i]
+    Kmin, Kmax, z_of_Kmax = _Rachford_Rice_K_bounds(zs, Ks)
     if Kmin > 1.0*(1-1e-15) or Kmax < 1.0*(1+1e-15):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
     V_over_F_min = ((Kmax-Kmin)*z_of_Kmax - (1.- Kmin))/((1.- Kmin)*(Kmax- 1.))
     V_over_F_max = 1./(1.-Kmin)
 
+    if N == 2 or N == 3:
+        # The poles of the two extreme K values bracket exactly one root;
+        # for two components V_over_F_min is itself the root, so it is no
+        # use as a bound against rounding
+        found, V_over_F = _Rachford_Rice_solution_closed_form(zs, Ks, 1.0/(1.0 - Kmax), V_over_F_max)
+        if found:
+            xs = [0.0]*N
+            ys = [0.0]*N
+            for i in range(N):
+                xs[i] = zs[i]/(1. + V_over_F*(Ks[i] - 1.0))
+                ys[i] = xs[i]*Ks[i]
+            return V_over_F, xs, ys
+
     V_over_F_min2 = V_over_F_min
     V_over_F_max2 = V_over_F_max
     if guess is not None and guess > V_over_F_min and guess < V_over_F_max:
@@ -838,28 +873,40 @@ def Rachford_Rice_solution(zs, Ks, fprime=False, fprime2=False, guess=None):
     else:
         x0 = (V_over_F_min2 + V_over_F_max2)*0.5
 
+    # All the per-component terms the objective and its derivatives need
+    # are computed once here, in a single pass, and indexed by the kernels
     K_minus_1 = [0.0]*N
     zs_k_minus_1 = [0.0]*N
-    for i in range(N):
-        Kim1 = Ks[i] - 1.0
-        K_minus_1[i] = Kim1
-        zs_k_minus_1[i] = zs[i]*Kim1
-
-    if fprime or fprime2:
-        zs_k_minus_1_2 = [0.0]*N
-        for i in range(N):
-            zs_k_minus_1_2[i] = -zs_k_minus_1[i]*K_minus_1[i]
-
+    zs_k_minus_1_2 = [0.0]*N
+    zs_k_minus_1_3 = [0.0]*N
     if fprime2:
-        zs_k_minus_1_3 = [0.0]*N
         for i in range(N):
-            zs_k_minus_1_3[i] = -2.0*zs_k_minus_1_2[i]*K_minus_1[i]
+            Kim1 = Ks[i] - 1.0
+            K_minus_1[i] = Kim1
+            zs_k_minus_1[i] = v = zs[i]*Kim1
+            zs_k_minus_1_2[i] = v = -v*Kim1
+            zs_k_minus_1_3[i] = -2.0*v*Kim1
+    elif fprime:
+        for i in range(N):
+            Kim1 = Ks[i] - 1.0
+            K_minus_1[i] = Kim1
+            zs_k_minus_1[i] = v = zs[i]*Kim1
+            zs_k_minus_1_2[i] = -v*Kim1
+    else:
+        for i in range(N):
+            Kim1 = Ks[i] - 1.0
+            K_minus_1[i] = Kim1
+            zs_k_minus_1[i] = zs[i]*Kim1
 
     try:
         low, high = V_over_F_min*one_epsilon_larger, V_over_F_max*one_epsilon_smaller
         if fprime2:
+            # Take a plain Newton step when the Halley correction would change
+            # the step by more than half; near an inflection the correction's
+            # denominator vanishes and the step overshoots
             V_over_F = halley(Rachford_Rice_err_fprime2, x0, ytol=1e-5, #fprime=True, fprime2=True,
-                              high=high, low=low, bisection=True, args=(zs_k_minus_1, zs_k_minus_1_2, zs_k_minus_1_3, K_minus_1))
+                              high=high, low=low, bisection=True, max_2nd_ratio=0.5,
+                              args=(zs_k_minus_1, zs_k_minus_1_2, zs_k_minus_1_3, K_minus_1))
         elif fprime:
             V_over_F = newton(Rachford_Rice_err_fprime, x0, ytol=1e-12, fprime=True, high=high,
                               low=low, bisection=True, args=(zs_k_minus_1, zs_k_minus_1_2, K_minus_1))
@@ -901,26 +948,24 @@ def Rachford_Rice_numpy_err_fprime2(V_over_F, zs_k_minus_1, K_minus_1):
 
 
 @mark_numba_uncacheable
-def Rachford_Rice_solution_numpy(zs, Ks, guess=None):
+def Rachford_Rice_solution_numpy(zs, Ks, guess=None, return_ndarray=False):
     """Undocumented version of Rachford_Rice_solution which works with numpy
     instead.
 
     Can be up to 15x faster for cases of 30000+ compounds; typically 7-10 x
-    faster.
+    faster. With `return_ndarray`, `xs` and `ys` are returned as arrays rather
+    than converted to lists.
     """
-    zs, Ks = np.array(zs), np.array(Ks) # numba: delete
-    N = len(Ks)
-    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
-    for i in range(N):
-        if zs[i] > 0.0:
-            if Ks[i] > Kmax:
-                z_of_Kmax = zs[i]
-                Kmax = Ks[i]
-            if Ks[i] < Kmin:
-                Kmin = Ks[i]
+    zs, Ks = np.asarray(zs, dtype=np.float64), np.asarray(Ks, dtype=np.float64) # numba: delete
+    present = zs > 0.0
+    Ks_present = Ks[present]
+    if Ks_present.size:
+        i = Ks_present.argmax()
+        Kmin, Kmax, z_of_Kmax = float(Ks_present.min()), float(Ks_present[i]), float(zs[present][i])
+    else:
+        Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
     if Kmin > 1.0*(1-1e-15) or Kmax < 1.0*(1+1e-15):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
 
     V_over_F_min = ((Kmax-Kmin)*z_of_Kmax - (1.-Kmin))/((1.-Kmin)*(Kmax-1.))
     V_over_F_max = 1./(1.-Kmin)
@@ -935,32 +980,149 @@ def Rachford_Rice_solution_numpy(zs, Ks, guess=None):
     else:
         V_over_F_max *= one_epsilon_smaller
 
-#    , one_epsilon_larger
-
-    V_over_F_min2 = V_over_F_min
-    V_over_F_max2 = V_over_F_max
     if guess is not None and guess > V_over_F_min and guess < V_over_F_max:
         x0 = guess
     else:
-        x0 = (V_over_F_min2 + V_over_F_max2)*0.5
-
+        x0 = (V_over_F_min + V_over_F_max)*0.5
 
     K_minus_1 = Ks - 1.0
     zs_k_minus_1 = zs*K_minus_1
 
+    low, high = V_over_F_min*one_epsilon_larger, V_over_F_max*one_epsilon_smaller
     try:
-        V_over_F = halley(Rachford_Rice_numpy_err_fprime2, x0, high=V_over_F_max*one_epsilon_smaller,
-                          low=V_over_F_min*one_epsilon_larger, xtol=1e-13, args=(zs_k_minus_1, K_minus_1),
+        V_over_F = halley(Rachford_Rice_numpy_err_fprime2, x0, high=high,
+                          low=low, xtol=1e-13, args=(zs_k_minus_1, K_minus_1),
                           bisection=True)
     except:
-        V_over_F = brenth(Rachford_Rice_numpy_err, V_over_F_max*one_epsilon_smaller, V_over_F_min*one_epsilon_larger,
-                          args=(zs_k_minus_1, K_minus_1))
+        V_over_F = brenth(Rachford_Rice_numpy_err, high, low, args=(zs_k_minus_1, K_minus_1))
 
-    xs = zs/(1.0 + V_over_F*K_minus_1)
-    ys = Ks*xs
+    # The work arrays are no longer needed; compute the compositions in them
+    xs = np.multiply(K_minus_1, V_over_F, zs_k_minus_1)
+    xs += 1.0
+    np.divide(zs, xs, xs)
+    ys = np.multiply(Ks, xs, K_minus_1)
 #    return V_over_F, xs, ys # numba: uncomment
+    if return_ndarray: # numba: delete
+        return float(V_over_F), xs, ys # numba: delete
     return float(V_over_F), xs.tolist(), ys.tolist() # numba: delete
 
+@mark_numba_incompatible
+def Rachford_Rice_solution_batch(zs, Ks, guess=None, xtol=1e-13, maxiter=100):
+    r'''Solves many independent Rachford-Rice flash problems at once, as
+    arises when flashing every cell of a grid or every step of a simulation.
+    The objective function is the same as in :obj:`Rachford_Rice_solution`;
+    all problems are iterated together with numpy.
+
+    Parameters
+    ----------
+    zs : ndarray
+        Overall mole fractions of all species in each problem; shape (M, N), [-]
+    Ks : ndarray
+        Equilibrium K-values of each problem; shape (M, N), [-]
+    guess : ndarray, optional
+        Optional initial guesses for the vapor fractions; shape (M,), [-]
+    xtol : float, optional
+        Absolute tolerance in the vapor fraction, [-]
+    maxiter : int, optional
+        Maximum number of iterations, [-]
+
+    Returns
+    -------
+    V_over_F : ndarray
+        Vapor fraction solutions, NaN where no positive-composition solution
+        exists or the iteration did not converge in `maxiter` iterations;
+        shape (M,), [-]
+    xs : ndarray
+        Mole fractions of each species in the liquid phase; shape (M, N), [-]
+    ys : ndarray
+        Mole fractions of each species in the vapor phase; shape (M, N), [-]
+
+    Notes
+    -----
+    The objective function decreases monotonically between the poles of the
+    largest and smallest K values, so its sign keeps a bracket around each
+    root. Halley's method is used inside that bracket and a bisection step is
+    taken whenever it would leave the bracket. Problems are dropped from the
+    iteration as they converge.
+
+    The initial guess is the midpoint of the bounds of [1]_, as in
+    :obj:`Rachford_Rice_solution`.
+
+    Examples
+    --------
+    >>> V_over_F, xs, ys = Rachford_Rice_solution_batch([[0.5, 0.3, 0.2], [0.4, 0.5, 0.1]], [[1.685, 0.742, 0.532], [1.3, 1.1, 1.2]])
+    >>> V_over_F
+    array([0.69073026,        nan])
+
+    References
+    ----------
+    .. [1] Li, Yinghui, Russell T. Johns, and Kaveh Ahmadi. "A Rapid and Robust
+       Alternative to Rachford-Rice in Flash Calculations." Fluid Phase
+       Equilibria 316 (February 25, 2012): 85-97.
+       doi:10.1016/j.fluid.2011.12.005.
+    '''
+    zs, Ks = np.asarray(zs, dtype=np.float64), np.asarray(Ks, dtype=np.float64)
+    if zs.ndim != 2 or zs.shape != Ks.shape:
+        raise ValueError("zs and Ks must be two dimensional and of the same shape")
+    rows = np.arange(zs.shape[0])
+    present = zs > 0.0
+    Ks_present = np.where(present, Ks, -np.inf)
+    i_max = Ks_present.argmax(axis=1)
+    Kmax, z_of_Kmax = Ks_present[rows, i_max], zs[rows, i_max]
+    Kmin = np.where(present, Ks, np.inf).min(axis=1)
+    solvable = (Kmin < 1.0*(1-1e-15)) & (Kmax > 1.0*(1+1e-15))
+    # Give the rows without a solution a harmless bracket; they are not iterated
+    Kmin = np.where(solvable, Kmin, 0.5)
+    Kmax = np.where(solvable, Kmax, 2.0)
+
+    low = 1.0/(1.0 - Kmax)
+    high = 1.0/(1.0 - Kmin)
+    V_over_F_min = ((Kmax-Kmin)*z_of_Kmax - (1.- Kmin))/((1.- Kmin)*(Kmax- 1.))
+    V_over_F = (V_over_F_min + high)*0.5
+    if guess is not None:
+        guess = np.broadcast_to(np.asarray(guess, dtype=np.float64), V_over_F.shape)
+        V_over_F = np.where((guess > V_over_F_min) & (guess < high), guess, V_over_F)
+
+    K_minus_1 = Ks - 1.0
+    zs_k_minus_1 = zs*K_minus_1
+    # Absent components would otherwise give 0*inf at their own poles
+    K_minus_1_present = np.where(present, K_minus_1, 0.0)
+
+    active = np.nonzero(solvable)[0]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(maxiter):
+            if not active.size:
+                break
+            VF = V_over_F[active]
+            Km1 = K_minus_1_present[active]
+            x0 = 1.0/(1.0 + VF[:, None]*Km1)
+            terms = zs_k_minus_1[active]*x0
+            err = terms.sum(axis=1)
+            terms *= Km1*x0
+            fprime = -terms.sum(axis=1)
+            terms *= Km1*x0
+            fprime2 = 2.0*terms.sum(axis=1)
+
+            positive = err > 0.0
+            lo = np.where(positive, VF, low[active])
+            hi = np.where(positive, high[active], VF)
+            low[active], high[active] = lo, hi
+
+            VF_new = VF - 2.0*err*fprime/(2.0*fprime*fprime - err*fprime2)
+            VF_new = np.where((VF_new > lo) & (VF_new < hi), VF_new, 0.5*(lo + hi))
+            converged = err == 0.0
+            VF_new = np.where(converged, VF, VF_new)
+            V_over_F[active] = VF_new
+            converged |= np.abs(VF_new - VF) <= xtol
+            active = active[~converged]
+
+    V_over_F[~solvable] = np.nan
+    # Rows still iterating after maxiter are not converged
+    V_over_F[active] = np.nan
+    xs = zs/(1.0 + V_over_F[:, None]*K_minus_1)
+    ys = Ks*xs
+    return V_over_F, xs, ys
+
 def Rachford_Rice_err_fprime_Leibovici_Neoschil_dd(VF_r, VF_e, zs_k_minus_1_r, zs_k_minus_1_e,
                                                    zs_k_minus_1_r_2_r, zs_k_minus_1_r_2_e,
                                                    Km1r, Km1e, VF_min_r, VF_min_e, VF_max_r, VF_max_e):
@@ -980,7 +1142,11 @@ def Rachford_Rice_err_fprime_Leibovici_Neoschil_dd(VF_r, VF_e, zs_k_minus_1_r, z
 
         # Add the error to the derivative variables
         plan_diffr, plan_diffe = add_dd(plan_diffr, plan_diffe, tmpr, tmpe)
+    return _Rachford_Rice_err_fprime_Leibovici_Neoschil_dd_finish(plain_errr, plain_erre, plan_diffr, plan_diffe,
+                                                                 VF_r, VF_e, VF_min_r, VF_min_e, VF_max_r, VF_max_e)
 
+def _Rachford_Rice_err_fprime_Leibovici_Neoschil_dd_finish(plain_errr, plain_erre, plan_diffr, plan_diffe,
+                                                          VF_r, VF_e, VF_min_r, VF_min_e, VF_max_r, VF_max_e):
     # err = (V_over_F - V_over_F_min)*(V_over_F_max - V_over_F)*plain_err
     errr, erre = add_dd(VF_r, VF_e, -VF_min_r, -VF_min_e)
     tmpr, tmpe = add_dd(VF_max_r, VF_max_e, -VF_r, -VF_e)
@@ -1008,14 +1174,40 @@ def Rachford_Rice_err_fprime_Leibovici_Neoschil_dd(VF_r, VF_e, zs_k_minus_1_r, z
 
     return errr, erre, fprimer, fprimee
 
+def _sum_dd_numpy(valuesr, valuese):
+    # Pairwise summation of double-double values stored as two arrays; every
+    # level is a single vectorized add_dd
+    while valuesr.shape[0] > 1:
+        if valuesr.shape[0] & 1:
+            valuesr, valuese = np.append(valuesr, 0.0), np.append(valuese, 0.0)
+        valuesr, valuese = add_dd(valuesr[0::2], valuese[0::2], valuesr[1::2], valuese[1::2])
+    return float(valuesr[0]), float(valuese[0])
+
+def Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil_dd(VF_r, VF_e, zs_k_minus_1_r, zs_k_minus_1_e,
+                                                         zs_k_minus_1_r_2_r, zs_k_minus_1_r_2_e,
+                                                         Km1r, Km1e, VF_min_r, VF_min_e, VF_max_r, VF_max_e):
+    # The double-double operations are branch-free, so they apply elementwise
+    # to the arrays of high and low parts
+    denr, dene = mul_dd(VF_r, VF_e, Km1r, Km1e)
+    denr, dene = add_dd(1.0, 0.0, denr, dene)
+    VF_kim1_1_invr, VF_kim1_1_inve = div_dd(1.0, 0.0, denr, dene)
+    tmpr, tmpe = mul_dd(zs_k_minus_1_r, zs_k_minus_1_e, VF_kim1_1_invr, VF_kim1_1_inve)
+    plain_errr, plain_erre = _sum_dd_numpy(tmpr, tmpe)
+
+    tmpr, tmpe = mul_dd(VF_kim1_1_invr, VF_kim1_1_inve, VF_kim1_1_invr, VF_kim1_1_inve)
+    tmpr, tmpe = mul_dd(zs_k_minus_1_r_2_r, zs_k_minus_1_r_2_e, tmpr, tmpe)
+    plan_diffr, plan_diffe = _sum_dd_numpy(tmpr, tmpe)
+    return _Rachford_Rice_err_fprime_Leibovici_Neoschil_dd_finish(plain_errr, plain_erre, plan_diffr, plan_diffe,
+                                                                 VF_r, VF_e, VF_min_r, VF_min_e, VF_max_r, VF_max_e)
+
 
 
 def Rachford_Rice_err_fprime_Leibovici_Neoschil(V_over_F, zs_k_minus_1, zs_k_minus_1_2, K_minus_1, V_over_F_min, V_over_F_max):
     plain_err, plan_diff = 0.0, 0.0
-    for num0, num1, Kim1 in zip(zs_k_minus_1, zs_k_minus_1_2, K_minus_1):
-        VF_kim1_1_inv = 1.0/(1. + V_over_F*Kim1)
-        plain_err += num0*VF_kim1_1_inv
-        plan_diff += num1*VF_kim1_1_inv*VF_kim1_1_inv
+    for i in range(len(K_minus_1)):
+        VF_kim1_1_inv = 1.0/(1. + V_over_F*K_minus_1[i])
+        plain_err += zs_k_minus_1[i]*VF_kim1_1_inv
+        plan_diff += zs_k_minus_1_2[i]*VF_kim1_1_inv*VF_kim1_1_inv
     err = (V_over_F - V_over_F_min)*(V_over_F_max - V_over_F)*plain_err
     fprime = (plan_diff*(-V_over_F + V_over_F_max)*(V_over_F - V_over_F_min)
               + plain_err*(-V_over_F + V_over_F_max)
@@ -1023,6 +1215,16 @@ def Rachford_Rice_err_fprime_Leibovici_Neoschil(V_over_F, zs_k_minus_1, zs_k_min
     # print(err, V_over_F)
     return err, fprime
 
+def Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil(V_over_F, zs_k_minus_1, zs_k_minus_1_2, K_minus_1, V_over_F_min, V_over_F_max):
+    VF_kim1_1_inv = 1.0/(1.0 + V_over_F*K_minus_1)
+    plain_err = float(np.dot(zs_k_minus_1, VF_kim1_1_inv))
+    plan_diff = float(np.dot(zs_k_minus_1_2, VF_kim1_1_inv*VF_kim1_1_inv))
+    err = (V_over_F - V_over_F_min)*(V_over_F_max - V_over_F)*plain_err
+    fprime = (plan_diff*(-V_over_F + V_over_F_max)*(V_over_F - V_over_F_min)
+              + plain_err*(-V_over_F + V_over_F_max)
+              + plain_err*(-V_over_F + V_over_F_min))
+    return err, fprime
+
 
 @mark_numba_uncacheable
 def Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks, guess=None):
@@ -1084,21 +1286,30 @@ def Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks, guess=None):
        303-8. https://doi.org/10.1016/0378-3812(92)85069-K.
     '''
     N = len(Ks)
-    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
-    for i in range(N):
-        if zs[i] > 0.0:
-            if Ks[i] > Kmax:
-                z_of_Kmax = zs[i]
-                Kmax = Ks[i]
-            if Ks[i] < Kmin:
-                Kmin = Ks[i]
+    Kmin, Kmax, z_of_Kmax = _Rachford_Rice_K_bounds(zs, Ks)
     if Kmin > 1.0*(1-1e-15) or Kmax < 1.0*(1+1e-15):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
     V_over_F_min = ((Kmax-Kmin)*z_of_Kmax - (1.- Kmin))/((1.- Kmin)*(Kmax- 1.))
     V_over_F_min_LN = -1.0/(Kmax-1) # There is a special lower limit to use for this method
     V_over_F_max = 1./(1.-Kmin)
 
+    if N == 2:
+        # The objective is linear once its denominators are cleared; the
+        # liquid fraction is found the same way from the inverted K values
+        K0, K1 = Ks[0], Ks[1]
+        Ks_inv = [0.0]*N
+        Ks_inv[0], Ks_inv[1] = 1.0/K0, 1.0/K1
+        found, V_over_F = _Rachford_Rice_solution_closed_form(zs, Ks, V_over_F_min_LN, V_over_F_max)
+        found_L, LF = _Rachford_Rice_solution_closed_form(zs, Ks_inv, 1.0/(1.0 - 1.0/Kmin), 1.0/(1.0 - 1.0/Kmax))
+        if found and found_L:
+            # The phase compositions of a binary do not depend on the feed;
+            # this form has no cancellation even when a phase is nearly pure
+            xs = [0.0]*N
+            ys = [0.0]*N
+            xs[0], xs[1] = (1.0 - K1)/(K0 - K1), (K0 - 1.0)/(K0 - K1)
+            ys[0], ys[1] = K0*xs[0], K1*xs[1]
+            return LF, V_over_F, xs, ys
+
     if guess is not None and guess > V_over_F_min and guess < V_over_F_max:
         x0 = guess
     else:
@@ -1112,34 +1323,47 @@ def Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks, guess=None):
     for i in range(N):
         Kim1 = Ks[i] - 1.0
         K_minus_1[i] = Kim1
-        zs_k_minus_1[i] = zs[i]*Kim1
-        zs_k_minus_1_2[i] = -zs_k_minus_1[i]*K_minus_1[i]
+        zs_k_minus_1[i] = v = zs[i]*Kim1
+        zs_k_minus_1_2[i] = -v*Kim1
 
     # Right the boundaries, the derivative goes very large and microscopic steps are made and the newton solver switches
     # The boundaries need to be handled with bisection-style solvers
     # The 1e-15 tolerance is able to be found with the 10*epsilon limits.
     low, high = V_over_F_min*one_10_epsilon_larger, V_over_F_max*one_10_epsilon_smaller
-    V_over_F = newton(Rachford_Rice_err_fprime_Leibovici_Neoschil, x0, xtol=1e-15, ytol=1e-5, fprime=True, high=high,
-                        low=low, bisection=True, args=(zs_k_minus_1, zs_k_minus_1_2, K_minus_1, V_over_F_min_LN, V_over_F_max))
-
-    # For maximum accuracy, the equation should be re-solved to obtain 16 digits
-    # of precision for the liquid fraction
-    # Fortunately, we have an extremely good guess.
-    # We can re-use the same arrays.
-    for i in range(N):
-        Kim1 = 1.0/Ks[i] - 1.0
-        K_minus_1[i] = Kim1
-        zs_k_minus_1[i] = zs[i]*Kim1
-        zs_k_minus_1_2[i] = -zs_k_minus_1[i]*K_minus_1[i]
-
-    # Translate the limits, noting that Kmin and Kmax are their inverses
-    # and they trade places.
-    x0 = 1.0 - V_over_F
-    L_over_F_min_LN = -1.0/(1/Kmin-1)
-    L_over_F_max = 1./(1.-1/Kmax)
-    # Try to polish it but do not require a ytol, but do allow it to exit on hitting a boundary or there being a large ytol error.
-    LF = newton(Rachford_Rice_err_fprime_Leibovici_Neoschil, x0, xtol=1e-15, ytol=1e100, fprime=True, high=x0+1e-4,
-                    low=x0-1e-4, bisection=True, args=(zs_k_minus_1, zs_k_minus_1_2, K_minus_1, L_over_F_min_LN, L_over_F_max))
+    err_fprime = Rachford_Rice_err_fprime_Leibovici_Neoschil
+    num0s, num1s, Kim1s = zs_k_minus_1, zs_k_minus_1_2, K_minus_1
+    # With many components the residual is cheaper to evaluate with numpy
+    vectorized = N >= 50 and not IS_PYPY # numba: delete
+    if vectorized: # numba: delete
+        err_fprime = Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil # numba: delete
+        num0s, num1s, Kim1s = np.array(zs_k_minus_1), np.array(zs_k_minus_1_2), np.array(K_minus_1) # numba: delete
+    V_over_F = newton(err_fprime, x0, xtol=1e-15, ytol=1e-5, fprime=True, high=high,
+                        low=low, bisection=True, args=(num0s, num1s, Kim1s, V_over_F_min_LN, V_over_F_max))
+
+    LF = 1.0 - V_over_F
+    if V_over_F > 0.5:
+        # For maximum accuracy, the equation should be re-solved to obtain 16 digits
+        # of precision for the liquid fraction; when it is at least 0.5 the
+        # subtraction loses nothing and the polish is skipped.
+        # Fortunately, we have an extremely good guess.
+        # We can re-use the same arrays.
+        for i in range(N):
+            Kim1 = 1.0/Ks[i] - 1.0
+            K_minus_1[i] = Kim1
+            zs_k_minus_1[i] = v = zs[i]*Kim1
+            zs_k_minus_1_2[i] = -v*Kim1
+
+        # Translate the limits, noting that Kmin and Kmax are their inverses
+        # and they trade places.
+        x0 = LF
+        L_over_F_min_LN = -1.0/(1/Kmin-1)
+        L_over_F_max = 1./(1.-1/Kmax)
+        num0s, num1s, Kim1s = zs_k_minus_1, zs_k_minus_1_2, K_minus_1
+        if vectorized: # numba: delete
+            num0s, num1s, Kim1s = np.array(zs_k_minus_1), np.array(zs_k_minus_1_2), np.array(K_minus_1) # numba: delete
+        # Try to polish it but do not require a ytol, but do allow it to exit on hitting a boundary or there being a large ytol error.
+        LF = newton(err_fprime, x0, xtol=1e-15, ytol=1e100, fprime=True, high=x0+1e-4,
+                        low=x0-1e-4, bisection=True, args=(num0s, num1s, Kim1s, L_over_F_min_LN, L_over_F_max))
 
     xs = zs_k_minus_1
     ys = K_minus_1
@@ -1158,15 +1382,12 @@ def Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks, guess=None):
 
     # The following trick can ensure the compositions sum to 1; small precision
     # gain but sometimes a large error can still exist.
-    i_max_x = xs.index(max(xs))# numba: delete
-
-#    max_x = 0  # numba: uncomment
-#    i_max_x = 0 # numba: uncomment
-#    for i in range(N): # numba: uncomment
-#        if xs[i] > max_x: # numba: uncomment
-#            max_x = xs[i] # numba: uncomment
-#            i_max_x = i # numba: uncomment
-
+    max_x = xs[0]
+    i_max_x = 0
+    for i in range(1, N):
+        if xs[i] > max_x:
+            max_x = xs[i]
+            i_max_x = i
 
     x_sum = sum(xs)
     xs[i_max_x] = xs[i_max_x]  + (1.0-x_sum)
@@ -1239,17 +1460,9 @@ def Rachford_Rice_solution_Leibovici_Neoschil_dd(zs, Ks, guess=None):
     N = len(Ks)
     if N == 2:
         return Rachford_Rice_solution_binary_dd(zs, Ks)
-    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
-    for i in range(N):
-        if zs[i] > 0.0:
-            if Ks[i] > Kmax:
-                z_of_Kmax = zs[i]
-                Kmax = Ks[i]
-            if Ks[i] < Kmin:
-                Kmin = Ks[i]
+    Kmin, Kmax, z_of_Kmax = _Rachford_Rice_K_bounds(zs, Ks)
     if Kmin > 1.0*(1-1e-15) or Kmax < 1.0*(1+1e-15):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
 
     numr, nume = add_dd(Kmax, 0, -Kmin, 0)
     numr, nume = mul_dd(numr, nume, z_of_Kmax, 0)
@@ -1308,10 +1521,19 @@ def Rachford_Rice_solution_Leibovici_Neoschil_dd(zs, Ks, guess=None):
     VF_minr, VF_mine = VFminr, VFmine
     VF_maxr, VF_maxe = VFmaxr, VFmaxe
 
+    err_fprime = Rachford_Rice_err_fprime_Leibovici_Neoschil_dd
+    num0sr, num0se, num1sr, num1se = zs_k_minus_1r, zs_k_minus_1e, zs_k_minus_1_2r, zs_k_minus_1_2e
+    Kim1sr, Kim1se = K_minus_1r, K_minus_1e
+    # Each double-double element costs several microseconds in Python; for
+    # large N do the elementwise work on arrays and sum pairwise instead
+    if N >= 75 and not IS_PYPY: # numba: delete
+        err_fprime = Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil_dd # numba: delete
+        num0sr, num0se, num1sr, num1se = np.array(num0sr), np.array(num0se), np.array(num1sr), np.array(num1se) # numba: delete
+        Kim1sr, Kim1se = np.array(Kim1sr), np.array(Kim1se) # numba: delete
+
     for it in range(100):
-        errr, erre, fprimer, fprimee = Rachford_Rice_err_fprime_Leibovici_Neoschil_dd(VFr, VFe,
-                                                                zs_k_minus_1r, zs_k_minus_1e, zs_k_minus_1_2r, zs_k_minus_1_2e,
-                                                       K_minus_1r, K_minus_1e, VFminLNr, VFminLNe, VFmaxr, VFmaxe)
+        errr, erre, fprimer, fprimee = err_fprime(VFr, VFe, num0sr, num0se, num1sr, num1se,
+                                                  Kim1sr, Kim1se, VFminLNr, VFminLNe, VFmaxr, VFmaxe)
         if errr > 0.0:
             VF_minr, VF_mine = VFr, VFe
         else:
@@ -1413,8 +1635,7 @@ def Rachford_Rice_solution_binary_dd(zs, Ks):
     z0, z1 = zs
     K0, K1 = Ks
     if (K0 < 1.0 and K1 < 1.0) or (K0 > 1.0 and K1 > 1.0):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#                raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
     l = 2
     xs = [0.0]*l
     ys = [0.0]*l
@@ -1527,10 +1748,10 @@ def Rachford_Rice_solution_mpmath(zs, Ks, dps=200, tol=1e-100):
         def Rachford_Rice_err_fprime(V_over_F):
             # Compute the objective function and its derivative w.r.t. V_over_F
             err0, err1 = 0, 0
-            for num0, num1, Kim1 in zip(zs_k_minus_1, zs_k_minus_1_2, K_minus_1):
-                VF_kim1_1_inv = 1/(1 + V_over_F*Kim1)
-                err0 += num0*VF_kim1_1_inv
-                err1 += num1*VF_kim1_1_inv*VF_kim1_1_inv
+            for i in range(len(K_minus_1)):
+                VF_kim1_1_inv = 1/(1 + V_over_F*K_minus_1[i])
+                err0 += zs_k_minus_1[i]*VF_kim1_1_inv
+                err1 += zs_k_minus_1_2[i]*VF_kim1_1_inv*VF_kim1_1_inv
             # print(V_over_F, err0, err1)
             return err0, err1
         return Rachford_Rice_err_fprime
@@ -1539,16 +1760,9 @@ def Rachford_Rice_solution_mpmath(zs, Ks, dps=200, tol=1e-100):
 
     solve_order = 1 # 1 for newton, 0 for secant - development only, should always return the correct answer
 
-    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
-    for i in range(N):
-        if zs[i] > 0.0:
-            if Ks[i] > Kmax:
-                z_of_Kmax = zs[i]
-                Kmax = Ks[i]
-            if Ks[i] < Kmin:
-                Kmin = Ks[i]
+    Kmin, Kmax, z_of_Kmax = _Rachford_Rice_K_bounds(zs, Ks)
     if Kmin > 1.0 or Kmax < 1.0:
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))
+        _raise_phase_count_reduced(Ks)
 
     z_of_Kmax, Kmin, Kmax = mpf(z_of_Kmax), mpf(Kmin), mpf(Kmax)
 
@@ -1657,6 +1871,25 @@ def Rachford_Rice_err_LN2(y, zs, cis_ys, x0, V_over_F_min, N):
     # print(F0, y)
     return F0, -dF0, ddF0
 
+def Rachford_Rice_numpy_err_LN2(y, zs, cis_ys, x0, V_over_F_min, N):
+    x1 = exp(-y)
+    x3 = 1.0/(x1 + 1.0)
+    x0x3 = x0*x3
+
+    x6 = x0x3*x3
+    x1x6 = x1*x6
+    t50 = V_over_F_min + x0x3
+    t51 = 1.0 - 2.0*x1*x3
+
+    x5 = 1.0/(t50 - cis_ys)
+    zix5 = zs*x5
+    x5x1x6 = x5*x1x6
+    x7 = zix5*x5x1x6
+    F0 = float(zix5.sum())
+    dF0 = float(x7.sum())
+    ddF0 = float(np.dot(x7, t51 + x5x1x6 + x5x1x6))
+    return F0, -dF0, ddF0
+
 @mark_numba_uncacheable
 def Rachford_Rice_solution_LN2(zs, Ks, guess=None):
     r'''Solves the a objective function for the Rachford-Rice flash equation
@@ -1748,17 +1981,9 @@ def Rachford_Rice_solution_LN2(zs, Ks, guess=None):
        https://doi.org/10.1016/S0098-1354(01)00767-0.
     '''
     N = len(Ks)
-    Kmin, Kmax, z_of_Kmax = 1e300, -1e300, 1e300
-    for i in range(N):
-        if zs[i] > 0.0:
-            if Ks[i] > Kmax:
-                z_of_Kmax = zs[i]
-                Kmax = Ks[i]
-            if Ks[i] < Kmin:
-                Kmin = Ks[i]
+    Kmin, Kmax, z_of_Kmax = _Rachford_Rice_K_bounds(zs, Ks)
     if Kmin > 1.0*(1-1e-15) or Kmax < 1.0*(1+1e-15):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
 
     one_m_Kmin = 1.0 - Kmin
     Kmax_m_one = (Kmax - 1.)
@@ -1793,8 +2018,7 @@ def Rachford_Rice_solution_LN2(zs, Ks, guess=None):
     else:
         near_high = V_over_F_max*one_epsilon_larger
     if (near_high-V_over_F_min) == 0.0:
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s"%(Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
     solver_high = -log((V_over_F_max-near_high)/(near_high-V_over_F_min))
 
     if V_over_F_min < 0.0:
@@ -1805,11 +2029,16 @@ def Rachford_Rice_solution_LN2(zs, Ks, guess=None):
         # V_over_F_min equals zero case, cannot evaluate there
         near_low = min(1e-20, V_over_F_max*1e-15)
     if (near_low-V_over_F_min) == 0.0:
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s"%(Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
     solver_low = -log((V_over_F_max-near_low)/(near_low-V_over_F_min))
 
-    V_over_F = newton(Rachford_Rice_err_LN2, guess, fprime=True, fprime2=True, xtol=1.48e-12, low=solver_low, high=solver_high, bisection=True, args=(zs, cis_ys, x0, V_over_F_min, N)) # numba: delete
+    err = Rachford_Rice_err_LN2 # numba: delete
+    zs_err, cis_ys_err = zs, cis_ys # numba: delete
+    # With many components the residual is cheaper to evaluate with numpy
+    if N >= 50 and not IS_PYPY: # numba: delete
+        err = Rachford_Rice_numpy_err_LN2 # numba: delete
+        zs_err, cis_ys_err = np.array(zs), np.array(cis_ys) # numba: delete
+    V_over_F = newton(err, guess, fprime=True, fprime2=True, xtol=1.48e-12, low=solver_low, high=solver_high, bisection=True, args=(zs_err, cis_ys_err, x0, V_over_F_min, N)) # numba: delete
 #    V_over_F = halley(Rachford_Rice_err_LN2, guess, xtol=1e-10, args=(zs, cis_ys, x0, V_over_F_min, N)) # numba: uncomment
     V_over_F = (V_over_F_min + (V_over_F_max - V_over_F_min)/(1.0 + exp(-V_over_F)))
 
@@ -1823,6 +2052,15 @@ def Rachford_Rice_solution_LN2(zs, Ks, guess=None):
         LF, xs, ys = Rachford_Rice_solution_LN2(zs, Ks_inv, guess=1.0-V_over_F)
         return V_over_F, ys, xs
 
+    elif err is Rachford_Rice_numpy_err_LN2: # numba: delete
+        # zs is already an array; compute the compositions in place # numba: delete
+        ys = np.array(Ks) # numba: delete
+        xs = ys - 1.0 # numba: delete
+        xs *= V_over_F # numba: delete
+        xs += 1.0 # numba: delete
+        np.divide(zs_err, xs, xs) # numba: delete
+        ys *= xs # numba: delete
+        return V_over_F, xs.tolist(), ys.tolist() # numba: delete
     else:
         xs = [0.0]*N
         for i in range(N):
@@ -1910,8 +2148,9 @@ def Li_Johns_Ahmadi_solution(zs, Ks, guess=None):
        doi:10.1016/j.fluid.2011.12.005.
     '''
     # Re-order both Ks and Zs by K value, higher coming first
-    p = sorted(zip(Ks,zs), reverse=True) # numba: delete
-    Ks_sorted, zs_sorted = [K for (K,z) in p], [z for (K,z) in p] # numba: delete
+    # Sorting indexes avoids building a tuple per component
+    sorted_idxs = sorted(range(len(Ks)), key=Ks.__getitem__, reverse=True) # numba: delete
+    Ks_sorted, zs_sorted = [Ks[i] for i in sorted_idxs], [zs[i] for i in sorted_idxs] # numba: delete
 #    sorted_idxs = np.argsort(Ks)[::-1] # numba: uncomment
 #    Ks_sorted, zs_sorted = Ks[sorted_idxs], zs[sorted_idxs] # numba: uncomment
 
@@ -1922,8 +2161,7 @@ def Li_Johns_Ahmadi_solution(zs, Ks, guess=None):
     kn = Ks_sorted[-1]
 
     if kn > 1.0*(1-1e-15) or k1 < 1.0*(1+1e-15):
-        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#        raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+        _raise_phase_count_reduced(Ks)
 
     x_max = (1. - kn)/(k1 - kn)
     x_min = x_max*z1
@@ -1985,94 +2223,25 @@ def Li_Johns_Ahmadi_solution(zs, Ks, guess=None):
     return V_over_F, Ks_sorted, zs_sorted
 
 
-def _Rachford_Rice_analytical_3(zs, Ks):
-    z1, z2, z3 = zs
-    K1, K2, K3 = Ks
-    x0 = K1*z1
-    x1 = K1*z2
-    x2 = K1*z3
-    x3 = K2*z1
-    x4 = K2*z2
-    x5 = K2*z3
-    x6 = K3*z1
-    x7 = K3*z2
-    x8 = K3*z3
-    x9 = K2*x0
-    x10 = K2*x1
-    x11 = K2*x2
-    x12 = K3*x0
-    x13 = K3*x1
-    x14 = K3*x2
-    x15 = K3*x4
-    x16 = K3*x5
-    x17 = x0 + x0
-    x18 = x17*x4
-    x19 = x5 + x5
-    x20 = x0*x19
-    x21 = x1*x19
-    x22 = x17*x7
-    x23 = x17*x8
-    x24 = x8 + x8
-    x25 = x1*x24
-    x26 = x3 + x3
-    x27 = x26*x7
-    x28 = x24*x3
-    x29 = x24*x4
-    x30 = K1*K1
-    x31 = z2*z2
-    x32 = x30*x31
-    x33 = z3*z3
-    x34 = x30*x33
-    x35 = K2*K2
-    x36 = z1*z1
-    x37 = x35*x36
-    x38 = x33*x35
-    x39 = K3*K3
-    x40 = x36*x39
-    x41 = x31*x39
-    x42 = K1 + K1
-    x43 = K2*x33
-    x44 = x42*x43
-    x45 = K3*x31
-    x46 = x42*x45
-    x47 = z2 + z2
-    x48 = x30*z3
-    x49 = K2 + K2
-    x50 = K3*x36
-    x51 = x49*x50
-    x52 = z1 + z1
-    x53 = x35*z3
-    x54 = x39*z2
-    x55 = 4.0*x12
-    x56 = 4.0*K1
-    x57 = K2*x56
-    x58 = x35*x47
-    x59 = x1 + x1
-    x60 = x39*z3
-    x61 = x30*x47
-    x62 = x4 + x4
-    x63 = x6 + x6
-    x64 = x7 + x7
-    x65 = K3 + K3
-
-    V_over_F = (-(-x0  + 0.5*(-x1 + x10 + x12 + x14 + x15
-                  + x16 - x2 - x3 - x5 - x6 - x7
-                  + x9) - x4  - x8  + z1 + z2 + z3 + (
-                 K3*x43*x56 - x0*x58 + 4.0*x13*x5 + x18 - x20 - x21 - x22 + x23
-                 - x25 - x27 - x28 + x29 + x30*(-x27 - x28 + x29 + x35*x52*z2
-                + x37 + x40 - x51) + x32 + x34*(x39 - x65 + 1.0) + x35*(-x22
-                 + x23 - x25 + x32 + x41 - x46) + x37 - x38*x65 + x38 + x39*(
-                x18 - x20 - x21 + x38 - x44 + x48*x52) + x4*x55 + x40 + x41
-                + x42*(-x37 - x40) - x44 - x46 + x48*(x26 + x47 - x62 - x63
-                - x64) + x49*(-x32 - x41) + x5*x55 - x51 + x53*(x59 + x52
-                -x17 + x54 + x54 - x63 - x64) + x54*(x52 - x17 - x26)
-                + x57*(x45 + x50) + x58*x6 + x60*(x26 -x17 + x59 - x62)
-                + x61*(x6 - x3)
-                )**0.5*0.5)/(
-                K3*(x10 + x11 - x3 + x9) + x0 + x1 - x10 - x11 - x12 - x13
-                - x14 - x15 - x16 + x2 + x3 + x4 + x5 + x6 + x7 + x8 - x9
-                - z1 - z2 - z3))
+def _rr_binary(z1, z2, K1, K2):
+    # The expanded denominator of the binary solution factors exactly; this
+    # form avoids its cancellation when both K values are near 1. Raises
+    # ZeroDivisionError when either K is exactly 1 or there is no feed.
+    one_m_K1, one_m_K2 = 1.0 - K1, 1.0 - K2
+    V_over_F = (z1*one_m_K1 + z2*one_m_K2)/((z1 + z2)*one_m_K1*one_m_K2)
+    x1 = z1/(1.0 - V_over_F*one_m_K1) if z1 != 0.0 else 0.0
+    x2 = z2/(1.0 - V_over_F*one_m_K2) if z2 != 0.0 else 0.0
+    xs = [x1, x2]
+    ys = [K1*x1, K2*x2]
+    return V_over_F, xs, ys
 
+def _Rachford_Rice_analytical_3(zs, Ks):
+    # Exactly one root of the quadratic lies between the poles of the
+    # largest and smallest K values
+    Kmin, Kmax = min(Ks), max(Ks)
+    found, V_over_F = _Rachford_Rice_solution_closed_form(zs, Ks, 1.0/(1.0 - Kmax), 1.0/(1.0 - Kmin))
+    if not found:
+        raise ValueError("No root between the poles")
 
     xs = [0.0]*3
     ys = [0.0]*3
@@ -2149,6 +2318,8 @@ def flash_inner_loop(zs, Ks, method=None, guess=None, check=False):
 
     The automatic algorithm selection will try an analytical solution, and use
     the Rachford-Rice method if there are 6 or more components in the mixture.
+    K values spanning more than three orders of magnitude are solved with
+    :obj:`Rachford_Rice_solution_LN2`.
 
     Parameters
     ----------
@@ -2205,9 +2376,24 @@ def flash_inner_loop(zs, Ks, method=None, guess=None, check=False):
     '''
     l = len(zs)
     if method is None:
-        method2 = FLASH_INNER_ANALYTICAL if l < 3 else (FLASH_INNER_NUMPY if (not IS_PYPY and l >= 10) else FLASH_INNER_LN2)
+        if l < 3:
+            method2 = FLASH_INNER_ANALYTICAL
+        elif not IS_PYPY and l >= 10 and max(Ks) <= 1e3*min(Ks):
+            method2 = FLASH_INNER_NUMPY
+        else:
+            # With widely spread K values the objective is very stiff next to
+            # its poles; the transformed objective of LN2 has none in the
+            # bracket and converges in far fewer iterations
+            method2 = FLASH_INNER_LN2
     else:
         method2 = method
+    if method2 != FLASH_INNER_NUMPY: # numba: delete
+        # The other solvers index the inputs one element at a time, which is
+        # several times slower on arrays than on lists
+        if type(zs) is ndarray: # numba: delete
+            zs = zs.tolist() # numba: delete
+        if type(Ks) is ndarray: # numba: delete
+            Ks = Ks.tolist() # numba: delete
     # if check:
     #     check = False
     if check:
@@ -2221,8 +2407,7 @@ def flash_inner_loop(zs, Ks, method=None, guess=None, check=False):
                 if K_high and K_low:
                     break
         if not K_low or not K_high:
-            raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" %(Ks)) # numba: delete
-#            raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
+            _raise_phase_count_reduced(Ks)
 
         for zi in zs:
             if zi == 0.0:
@@ -2259,6 +2444,12 @@ def flash_inner_loop(zs, Ks, method=None, guess=None, check=False):
                 return V_over_F, xs2, ys2
 
     if method2 == FLASH_INNER_LN2:
+        if method is None:
+            try:
+                return Rachford_Rice_solution_LN2(zs, Ks, guess)
+            except (PhaseCountReducedError, UnconvergedError, ZeroDivisionError, ValueError):
+                # e.g. a K of exactly one cannot be transformed
+                return Rachford_Rice_solution(zs, Ks, fprime=False, fprime2=False, guess=guess)
         return Rachford_Rice_solution_LN2(zs, Ks, guess)
     elif method2 == FLASH_INNER_LN:
         LF, VF, xs, ys = Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks, guess=guess)
@@ -2272,28 +2463,16 @@ def flash_inner_loop(zs, Ks, method=None, guess=None, check=False):
             z1, z2 = zs
             K1, K2 = Ks
             if (K1 < 1.0 and K2 < 1.0) or (K1 > 1.0 and K2 > 1.0):
-                raise PhaseCountReducedError("For provided K values, there is no positive-composition solution; Ks=%s" % (Ks))  # numba: delete
-#                raise PhaseCountReducedError("For provided K values, there is no positive-composition solution") # numba: uncomment
-            z1z2 = z1 + z2
-            K1z1 = K1*z1
-            K2z2 = K2*z2
-            t1 = z1z2 - K1z1 - K2z2
-            den = t1 + K2*K1z1 + K1*K2z2 - K1*z2 - K2*z1
-            if den != 0.0:
-                V_over_F = t1/den
-            else:
+                _raise_phase_count_reduced(Ks)
+            try:
+                return _rr_binary(z1, z2, K1, K2)
+            except ZeroDivisionError:
                 return Rachford_Rice_solution(zs=zs, Ks=Ks, guess=guess, fprime=False, fprime2=False)
         elif l == 3:
-            fail = False
             try:
-                sln = _Rachford_Rice_analytical_3(zs, Ks)
-            except:
-                fail = True
-            if not fail and sln[0].imag != 0.0:
-                fail = True
-            if fail:
+                return _Rachford_Rice_analytical_3(zs, Ks)
+            except (ValueError, ZeroDivisionError):
                 return Rachford_Rice_solution(zs=zs, Ks=Ks, guess=guess, fprime=False, fprime2=False)
-            return sln
         elif l == 4:
             return Rachford_Rice_solution_polynomial(zs, Ks)
         # Better to use a numerical solution
@@ -2305,16 +2484,6 @@ def flash_inner_loop(zs, Ks, method=None, guess=None, check=False):
             raise ValueError("Input dimensions are for one component! Rachford-Rice does not apply")
         else:
             raise ValueError('Only solutions for components counts 2, 3, and 4 are available analytically')
-        # Need to avoid zero divisions here - specifically when the composition of one component in the feed is 0.0
-        xs = [0.0]*l
-        ys = [0.0]*l
-        for i in range(l):
-            try:
-                xs[i] = zs[i]/(1.0 + V_over_F*Ks[i]-V_over_F)
-            except:
-                pass
-            ys[i] = xs[i]*Ks[i]
-        return V_over_F, xs, ys
 
     elif method2 == FLASH_INNER_NUMPY:
         try:
@@ -2349,33 +2518,48 @@ def Rachford_Rice_flashN_f_jac(betas, ns, Ks, Ksm1=None, zsKsm1=None):
         zsKsm1 = [[zi*Ksim1 for zi, Ksim1 in zip(ns, Ksm1i)] for Ksm1i in Ksm1] # numba: delete
 #        zsKsm1 = ns*Ksm1 # numba: uncomment
 
-    for i, zi in enumerate(ns):
+    for i in range(len(ns)):
         denom = 1.0
-        for j, beta_i in enumerate(betas):
-            denom += beta_i*Ksm1[j][i]
+        for j in range(N):
+            denom += betas[j]*Ksm1[j][i]
         denom_inv = 1.0/denom
         denom_inv2 = denom_inv*denom_inv
 
         for j in range(N):
-            Fs[j] += zsKsm1[j][i]*denom_inv
-
-        for j in range(N):
-            f = zsKsm1[j][i]*denom_inv2
+            zsKsm1_ji = zsKsm1[j][i]
+            Fs[j] += zsKsm1_ji*denom_inv
+            f = zsKsm1_ji*denom_inv2
+            row = dFs_dBetas[j]
             for k in range(j):
-                term = f*Ksm1[k][i]
-                dFs_dBetas[k][j] -= term
-                dFs_dBetas[j][k] -= term
-            dFs_dBetas[j][j] -= f*Ksm1[j][i]
+                row[k] -= f*Ksm1[k][i]
+            row[j] -= f*Ksm1[j][i]
+    # The jacobian is symmetric; only its lower triangle was accumulated
+    for j in range(N):
+        for k in range(j):
+            dFs_dBetas[k][j] = dFs_dBetas[j][k]
     # print(Fs, betas)
     return Fs, dFs_dBetas
 
 
-def Rachford_Rice_flash2_f_jac(betas, zs, Ks):
-    # In a more clever system like RR 2, can compute entire numerators before hand.
+def Rachford_Rice_numpy_flashN_f_jac(betas, ns, Ks, Ksm1, zsKsm1):
+    # Ksm1 and zsKsm1 are arrays of shape (phases - 1, components)
+    denom_inv = 1.0/(1.0 + np.dot(betas, Ksm1))
+    Fs = np.dot(zsKsm1, denom_inv)
+    dFs_dBetas = np.dot(zsKsm1*(denom_inv*denom_inv), Ksm1.T)
+    np.negative(dFs_dBetas, dFs_dBetas)
+    return Fs.tolist(), dFs_dBetas.tolist()
+
+def Rachford_Rice_flash2_f_jac(betas, zs, Ks, Ksm1=None, zsKsm1=None):
     beta_y = betas[0]
     beta_z = betas[1]
-    Ks_y = Ks[0]
-    Ks_z = Ks[1]
+    if Ksm1 is None:
+        Ksm1 = [[i-1.0 for i in Ks_i] for Ks_i in Ks] # numba: delete
+#        Ksm1 = Ks - 1.0 # numba: uncomment
+    if zsKsm1 is None:
+        zsKsm1 = [[zi*Ksim1 for zi, Ksim1 in zip(zs, Ksm1i)] for Ksm1i in Ksm1] # numba: delete
+#        zsKsm1 = zs*Ksm1 # numba: uncomment
+    Ksm1_y, Ksm1_z = Ksm1[0], Ksm1[1]
+    zsKsm1_y, zsKsm1_z = zsKsm1[0], zsKsm1[1]
     F0 = 0.0
     F1 = 0.0
     dF0_dy = 0.0
@@ -2383,12 +2567,11 @@ def Rachford_Rice_flash2_f_jac(betas, zs, Ks):
     dF1_dz = 0.0
 
     for i in range(len(zs)):
-        zi = zs[i]
-        Ky_m1 = (Ks_y[i] - 1.0)
-        Kz_m1 = (Ks_z[i] - 1.0)
+        Ky_m1 = Ksm1_y[i]
+        Kz_m1 = Ksm1_z[i]
         denom_inv = 1.0/(1.0 + beta_y*Ky_m1 + beta_z*Kz_m1) # same in all
-        delta_F0 = zi*Ky_m1*denom_inv
-        delta_F1 = zi*Kz_m1*denom_inv
+        delta_F0 = zsKsm1_y[i]*denom_inv
+        delta_F1 = zsKsm1_z[i]*denom_inv
 
         F0 += delta_F0
         F1 += delta_F1
@@ -2414,15 +2597,26 @@ def Rachford_Rice_valid_solution_naive(ns, betas, Ks, limit_betas=False):
             if beta < 0.0 or beta > 1.0:
                 return False
 
-    for i, ni in enumerate(ns):
-        sum_critiria = 1.0
-        for j, beta_i in enumerate(betas):
-            sum_critiria += beta_i*(Ks[j][i] - 1.0)
+    # Accumulate one K set at a time so each row is only looked up once
+    N = len(ns)
+    sum_critirias = [1.0]*N
+    for j in range(len(betas)):
+        beta_j, Ks_j = betas[j], Ks[j]
+        for i in range(N):
+            sum_critirias[i] += beta_j*(Ks_j[i] - 1.0)
+    for sum_critiria in sum_critirias:
         if sum_critiria < 0.0:
             # Will result in negative composition for xi, yi, and zi
             return False
     return True
 
+def Rachford_Rice_numpy_valid_solution_naive(betas, Ksm1, limit_betas=False):
+    if limit_betas:
+        for beta in betas:
+            if beta < 0.0 or beta > 1.0:
+                return False
+    return not (np.dot(betas, Ksm1) < -1.0).any()
+
 
 @mark_numba_uncacheable
 def Rachford_Rice_solutionN(ns, Ks, betas):
@@ -2467,7 +2661,7 @@ def Rachford_Rice_solutionN(ns, Ks, betas):
     >>> Ks_y = [1.23466988745, 0.89727701141, 2.29525708098, 1.58954899888, 0.23349348597, 0.02038108640, 1.40715641002]
     >>> Ks_z = [1.52713341421, 0.02456487977, 1.46348240453, 1.16090546194, 0.24166289908, 0.14815282572, 14.3128010831]
     >>> Rachford_Rice_solutionN(ns, [Ks_y, Ks_z], [.1, .6])
-    ([0.6868328915094767, 0.06019424397668605, 0.25297286451383727], [[0.21147483364299702, 0.07313470386530294, 0.3198289138763589, 0.33293382568889657, 0.03658604244379159, 0.004616341311925657, 0.02142533917172731], [0.26156812278601893, 0.00200221914149187, 0.203926606651898, 0.2431536850887592, 0.03786610596908296, 0.033556798515399944, 0.21792646184834918], [0.1712804659711611, 0.08150738616425436, 0.13934339491931877, 0.20945175387703213, 0.15668977784027896, 0.22650123851718015, 0.015225982711774586]])
+    ([0.6868328915094766, 0.06019424397668606, 0.2529728645138374], [[0.21147483364299702, 0.07313470386530294, 0.31982891387635903, 0.33293382568889657, 0.036586042443791586, 0.004616341311925655, 0.02142533917172731], [0.26156812278601893, 0.00200221914149187, 0.20392660665189805, 0.2431536850887592, 0.03786610596908295, 0.03355679851539993, 0.21792646184834918], [0.1712804659711611, 0.08150738616425436, 0.1393433949193188, 0.20945175387703213, 0.15668977784027893, 0.22650123851718007, 0.015225982711774586]])
 
     References
     ----------
@@ -2531,8 +2725,19 @@ def Rachford_Rice_solutionN(ns, Ks, betas):
     #     plt.show()
 
 
-    betas, _ = newton_system(Rachford_Rice_flashN_f_jac, jac=True,
-                             x0=betas, args=(ns, Ks, Ksm1, zsKsm1), solve_func=solve_func,
+    f_jac = Rachford_Rice_flashN_f_jac # numba: delete
+    f_jac_args = (ns, Ks, Ksm1, zsKsm1) # numba: delete
+    N_components = len(ns) # numba: delete
+    if not IS_PYPY and (N_components >= 30 or (phase_count_m1 > 2 and N_components >= 5)): # numba: delete
+        # The jacobian is a single matrix product with numpy # numba: delete
+        f_jac, f_jac_args = Rachford_Rice_numpy_flashN_f_jac, (ns, Ks, np.array(Ksm1), np.array(zsKsm1)) # numba: delete
+    elif phase_count_m1 == 2: # numba: delete
+        # The kernel specialized for two betas is several times faster # numba: delete
+        f_jac = Rachford_Rice_flash2_f_jac # numba: delete
+    betas, _ = newton_system(f_jac, jac=True, # numba: delete
+                             x0=betas, args=f_jac_args, solve_func=solve_func, # numba: delete
+#    betas, _ = newton_system(Rachford_Rice_flashN_f_jac, jac=True, # numba: uncomment
+#                             x0=betas, args=(ns, Ks, Ksm1, zsKsm1), solve_func=solve_func, # numba: uncomment
                              xtol=1e-12,
                              # ytol=1e-14,
                              damping_func=RRN_new_betas
@@ -2546,15 +2751,21 @@ def Rachford_Rice_solutionN(ns, Ks, betas):
 
 #    print(betas, iter, 'current progress')
     N = len(ns)
+    if N >= 30 and f_jac is Rachford_Rice_numpy_flashN_f_jac: # numba: delete
+        # Ks - 1 is already an array; build the compositions with numpy # numba: delete
+        ref_comp = np.array(ns) # numba: delete
+        ref_comp /= 1.0 + np.dot(betas, f_jac_args[2]) # numba: delete
+        if (1.0 - float(ref_comp.sum())) > 1e-10: # numba: delete
+            raise ValueError("Converged to nonphysical solution") # numba: delete
+        comps = (np.array(Ks)*ref_comp).tolist() # numba: delete
+        comps.append(ref_comp.tolist()) # numba: delete
+        return all_betas, comps # numba: delete
     ref_comp = [0.0]*N
-    ref_comp_sum = 0.0
     for i in range(N):
         denom = 1.0
         for j in range(phase_count_m1):
             denom += betas[j]*(Ks[j][i]-1.0)
-        zi = ns[i]/denom
-        ref_comp[i] = zi
-        ref_comp_sum += zi
+        ref_comp[i] = ns[i]/denom
 
 #    comps = np.empty((phase_count, N), np.float64) # numba: uncomment
     comps = [] # numba: delete
@@ -2569,12 +2780,29 @@ def Rachford_Rice_solutionN(ns, Ks, betas):
     comps.append(ref_comp) # numba: delete
 #    comps[phase_count_m1] = ref_comp  # numba: uncomment
 
-    if (1.0 - ref_comp_sum) > 1e-10:
+    if (1.0 - sum(ref_comp)) > 1e-10:
         raise ValueError("Converged to nonphysical solution")
 
     return all_betas, comps
 
 
+def RRN_max_damping(betas, d_betas, Ks):
+    # Each 1 + sum_j (beta_j + damping*d_beta_j)*(K_ji - 1) is linear in the
+    # damping; return the largest damping keeping all of them non-negative
+    N = len(betas)
+    damping_max = 1e100
+    for i in range(len(Ks[0])):
+        denom, d_denom = 1.0, 0.0
+        for j in range(N):
+            Kjm1 = Ks[j][i] - 1.0
+            denom += betas[j]*Kjm1
+            d_denom += d_betas[j]*Kjm1
+        if d_denom < 0.0:
+            damping_i = -denom/d_denom
+            if damping_i < damping_max:
+                damping_max = damping_i
+    return damping_max
+
 def RRN_new_betas(betas, d_betas, damping, ns, Ks, *args):
     N = len(betas)
     limit_betas = False
@@ -2589,12 +2817,25 @@ def RRN_new_betas(betas, d_betas, damping, ns, Ks, *args):
     betas_test = [0.0]*N
     for i in range(N):
         betas_test[i] = betas[i] + d_betas[i]*damping
-    for i in range(20):
-        is_valid = Rachford_Rice_valid_solution_naive(ns, betas_test, Ks, limit_betas=limit_betas)
-        if is_valid:
+    # Ks - 1 is already an array when the numpy jacobian is in use
+    Ksm1_arr = args[0] if (args and type(args[0]) is ndarray) else None # numba: delete
+    halvings, damping_max = 0, 1e100
+    while True:
+        if Ksm1_arr is not None: # numba: delete
+            is_valid = Rachford_Rice_numpy_valid_solution_naive(betas_test, Ksm1_arr, limit_betas=limit_betas) # numba: delete
+        else: # numba: delete
+            is_valid = Rachford_Rice_valid_solution_naive(ns, betas_test, Ks, limit_betas=limit_betas) # numba: delete
+#        is_valid = Rachford_Rice_valid_solution_naive(ns, betas_test, Ks, limit_betas=limit_betas) # numba: uncomment
+        if is_valid or halvings == 19:
             break
-
+        if halvings == 0:
+            damping_max = RRN_max_damping(betas, d_betas, Ks)
         damping = 0.5*damping
+        halvings += 1
+        # Skip the halvings which cannot satisfy every component
+        while damping > damping_max and halvings < 19:
+            damping = 0.5*damping
+            halvings += 1
         for i in range(N):
             betas_test[i] = betas[i] + d_betas[i]*damping
     if not is_valid:
@@ -2766,10 +3007,14 @@ def Rachford_Rice_solution2(ns, Ks_y, Ks_z, beta_y=0.5, beta_z=1e-6):
 #                                        xtol=1e-11, ytol=1e100, maxiter=100,
 #                                            args=(ns, Ks), damping=1.0,
 #                                           damping_func=RRN_new_betas)
+    Ksm1 = [[i-1.0 for i in Ks_i] for Ks_i in Ks] # numba: delete
+#    Ksm1 = Ks - 1.0 # numba: uncomment
+    zsKsm1 = [[zi*Ksim1 for zi, Ksim1 in zip(ns, Ksm1i)] for Ksm1i in Ksm1] # numba: delete
+#    zsKsm1 = ns*Ksm1 # numba: uncomment
     # Rachford_Rice_flash2_f_jac is over twice as fast! Do not change to the generic one.
     betas, iters = newton_system(Rachford_Rice_flash2_f_jac, x0=betas, jac=True,
                                             xtol=1e-11, ytol=1e100, maxiter=100,
-                                           args=(ns, Ks), damping=1.0,
+                                           args=(ns, Ks, Ksm1, zsKsm1), damping=1.0,
                                            damping_func=RRN_new_betas, solve_func=solve_2_direct)
     beta_y = betas[0]
     beta_z = betas[1]
@@ -22,6 +22,13 @@ def Li_Johns_Ahmadi_solution(
 ) -> Tuple[float, List[float], List[float]]: ...
 
 
+def RRN_max_damping(
+    betas: List[float],
+    d_betas: List[float],
+    Ks: List[List[float]]
+) -> float: ...
+
+
 def RRN_new_betas(
     betas: Union[List[float], List[float]],
     d_betas: List[float],
@@ -65,7 +72,9 @@ def Rachford_Rice_err_fprime2(
 def Rachford_Rice_flash2_f_jac(
     betas: Union[List[float], List[float]],
     zs: List[float],
-    Ks: List[List[float]]
+    Ks: List[List[float]],
+    Ksm1: Optional[List[List[float]]] = ...,
+    zsKsm1: Optional[List[List[float]]] = ...
 ) -> Tuple[List[float], List[List[float]]]: ...
 
 
@@ -88,6 +97,51 @@ def Rachford_Rice_numpy_err_fprime2(
 ) -> Tuple[float, float, float]: ...
 
 
+def Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil(
+    V_over_F: float,
+    zs_k_minus_1: ndarray,
+    zs_k_minus_1_2: ndarray,
+    K_minus_1: ndarray,
+    V_over_F_min: float,
+    V_over_F_max: float
+) -> Tuple[float, float]: ...
+
+
+def Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil_dd(
+    VF_r: float,
+    VF_e: float,
+    zs_k_minus_1_r: ndarray,
+    zs_k_minus_1_e: ndarray,
+    zs_k_minus_1_r_2_r: ndarray,
+    zs_k_minus_1_r_2_e: ndarray,
+    Km1r: ndarray,
+    Km1e: ndarray,
+    VF_min_r: float,
+    VF_min_e: float,
+    VF_max_r: float,
+    VF_max_e: float
+) -> Tuple[float, float, float, float]: ...
+
+
+def Rachford_Rice_numpy_err_LN2(
+    y: float,
+    zs: ndarray,
+    cis_ys: ndarray,
+    x0: float,
+    V_over_F_min: float,
+    N: int
+) -> Tuple[float, float, float]: ...
+
+
+def Rachford_Rice_numpy_flashN_f_jac(
+    betas: List[float],
+    ns: List[float],
+    Ks: List[List[float]],
+    Ksm1: ndarray,
+    zsKsm1: ndarray
+) -> Tuple[List[float], List[List[float]]]: ...
+
+
 def Rachford_Rice_polynomial(zs: List[float], Ks: Union[List[float], List[float]]) -> List[float]: ...
 
 
@@ -100,6 +154,9 @@ def Rachford_Rice_polynomial_4(zs: List[float], Cs: List[float]) -> List[float]:
 def Rachford_Rice_polynomial_5(zs: List[float], Cs: List[float]) -> List[float]: ...
 
 
+def Rachford_Rice_polynomial_6(zs: List[float], Cs: List[float]) -> List[float]: ...
+
+
 def Rachford_Rice_solution(
     zs: List[float],
     Ks: Union[List[float], List[float]],
@@ -132,11 +189,21 @@ def Rachford_Rice_solution_LN2(
 ) -> Tuple[float, List[float], List[float]]: ...
 
 
+def Rachford_Rice_solution_batch(
+    zs: ndarray,
+    Ks: ndarray,
+    guess: Optional[ndarray] = ...,
+    xtol: float = ...,
+    maxiter: int = ...
+) -> Tuple[ndarray, ndarray, ndarray]: ...
+
+
 def Rachford_Rice_solution_numpy(
     zs: List[float],
     Ks: Union[List[float], List[float]],
-    guess: None = ...
-) -> Tuple[float, List[float], List[float]]: ...
+    guess: None = ...,
+    return_ndarray: bool = ...
+) -> Tuple[float, Union[List[float], ndarray], Union[List[float], ndarray]]: ...
 
 
 def Rachford_Rice_solution_polynomial(
@@ -153,18 +220,33 @@ def Rachford_Rice_valid_solution_naive(
 ) -> bool: ...
 
 
+def Rachford_Rice_numpy_valid_solution_naive(
+    betas: List[float],
+    Ksm1: ndarray,
+    limit_betas: bool = ...
+) -> bool: ...
+
+
 def _Rachford_Rice_analytical_3(
     zs: List[float],
     Ks: List[float]
 ) -> Union[Tuple[complex, List[complex], List[complex]], Tuple[float, List[float], List[float]]]: ...
 
 
-def _Rachford_Rice_polynomial_coeff(value: int, zs: List[float], Cs: List[float], N: int) -> float: ...
+def _Rachford_Rice_solution_closed_form(
+    zs: List[float],
+    Ks: List[float],
+    V_over_F_min: float,
+    V_over_F_max: float
+) -> Tuple[bool, float]: ...
 
 
 def err_RR_poly(VF: float, poly: List[float]) -> float: ...
 
 
+def err_RR_poly_6(VF: float, poly: List[float]) -> float: ...
+
+
 def flash_inner_loop(
     zs: List[float],
     Ks: Union[List[float], List[float]],
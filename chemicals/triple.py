@@ -50,11 +50,12 @@ from chemicals import miscdata
 from chemicals.data_reader import (
     data_source,
     database_constant_lookup,
+    df_column_to_dict,
+    int64_dtype,
     list_available_methods_from_df_dict,
     register_df_source,
-    retrieve_any_from_df_dict,
-    retrieve_from_df_dict,
 )
+from chemicals.identifiers import CAS_to_int
 from chemicals.phase_change import Tm
 from chemicals.utils import PY37, can_load_data, mark_numba_incompatible, os_path_join, source_path
 
@@ -68,14 +69,37 @@ MELTING = 'MELTING'
 _triple_data_loaded = False
 def _load_triple_data():
     global triple_data_Staveley, _triple_data_loaded, Tt_sources, Pt_sources
+    global _Tt_values_by_method, _Pt_values_by_method, _int_indexed_methods
     triple_data_Staveley = data_source('Staveley 1981.tsv')
-    _triple_data_loaded = True
     Tt_sources = {
         miscdata.HEOS: miscdata.heos_data,
         STAVELEY: triple_data_Staveley,
         miscdata.WEBBOOK: miscdata.webbook_data,
     }
     Pt_sources = Tt_sources.copy()
+    # Flat {CASRN: value} dicts of the available values, keyed like the
+    # index of each table; looking these up is much faster than DataFrame.at
+    _Tt_values_by_method = {method: df_column_to_dict(df, 'Tt') for method, df in Tt_sources.items()}
+    _Pt_values_by_method = {method: df_column_to_dict(df, 'Pt') for method, df in Pt_sources.items()}
+    _int_indexed_methods = frozenset(method for method, df in Tt_sources.items()
+                                     if df.index.dtype is int64_dtype)
+    _triple_data_loaded = True
+
+def _triple_value(values_by_method, CASRN, method):
+    try:
+        values = values_by_method[method]
+    except KeyError:
+        raise ValueError('Invalid method: {}, allowed methods are {}'.format(
+                method, list(values_by_method)))
+    if method in _int_indexed_methods and isinstance(CASRN, str):
+        try: CASRN = CAS_to_int(CASRN)
+        except ValueError: return None
+    return values.get(CASRN)
+
+def _triple_any_value(values_by_method, CASRN):
+    for method in values_by_method:
+        value = _triple_value(values_by_method, CASRN, method)
+        if value is not None: return value
 
 if PY37:
     def __getattr__(name):
@@ -182,9 +206,9 @@ def Tt(CASRN, method=None):
         if method == MELTING:
             return Tm(CASRN)
         else:
-            return retrieve_from_df_dict(Tt_sources, CASRN, 'Tt', method)
+            return _triple_value(_Tt_values_by_method, CASRN, method)
     else:
-        Tt = retrieve_any_from_df_dict(Tt_sources, CASRN, 'Tt')
+        Tt = _triple_any_value(_Tt_values_by_method, CASRN)
         if Tt: return Tt
         return Tm(CASRN)
 
@@ -273,7 +297,7 @@ def Pt(CASRN, method=None):
         if found: return val
     if not _triple_data_loaded: _load_triple_data()
     if method:
-        return retrieve_from_df_dict(Pt_sources, CASRN, 'Pt', method)
+        return _triple_value(_Pt_values_by_method, CASRN, method)
     else:
-        return retrieve_any_from_df_dict(Pt_sources, CASRN, 'Pt')
+        return _triple_any_value(_Pt_values_by_method, CASRN)
 
@@ -25,6 +25,7 @@ __all__ = ['u']
 import types
 
 import chemicals
+from chemicals.utils import PY37
 
 try:
     from pint import _DEFAULT_REGISTRY as u
@@ -35,6 +36,8 @@ except ImportError: # pragma: no cover
                       'https://github.com/hgrecco/pint')
 from fluids.units import variable_output_wrapper, wrap_numpydoc_obj, wraps_numpydoc
 
+# Filled as objects are wrapped; with the lazy wrapping of Python 3.7+ it only
+# holds the names which have been accessed so far
 __pint_wrapped_functions = {}
 
 variable_output_unit_funcs = {
@@ -83,26 +86,40 @@ variable_output_unit_funcs = {
 }
 
 unwrapped_objects = frozenset(['PeriodicTable'])
+# Parsing the docstrings of every function is slow; only the names are
+# collected here, and each object is wrapped the first time it is accessed
+__unwrapped_objects = {}
 for name in dir(chemicals):
-    if name == '__getattr__' or name == '__test__':
+    if name == '__getattr__' or name == '__test__' or name == '__all__':
         continue
     obj = getattr(chemicals, name)
+    if type(obj) is types.ModuleType or isinstance(obj, str):
+        continue
+    __all__.append(name)
+    __unwrapped_objects[name] = obj
+
+def _wrap_chemicals_obj(name):
+    obj = __unwrapped_objects[name]
     if isinstance(obj, types.FunctionType):
         obj = wraps_numpydoc(u)(obj)
     elif type(obj) == type:
         if obj.__name__ not in unwrapped_objects:
             obj = wrap_numpydoc_obj(obj)
-    elif type(obj) is types.ModuleType:
-        continue
-    elif isinstance(obj, str):
-        continue
-    if name == '__all__':
-        continue
-    __all__.append(name)
-    __pint_wrapped_functions.update({name: obj})
+    __pint_wrapped_functions[name] = obj
+    if name in variable_output_unit_funcs:
+        val = variable_output_unit_funcs[name]
+        obj = variable_output_wrapper(__unwrapped_objects[name], obj, val[0], val[1])
+    return obj
 
-globals().update(__pint_wrapped_functions)
+if PY37:
+    def __getattr__(name):
+        if name in __unwrapped_objects:
+            obj = globals()[name] = _wrap_chemicals_obj(name)
+            return obj
+        raise AttributeError(f"module {__name__} has no attribute {name}")
 
-for name, val in variable_output_unit_funcs.items():
-    globals()[name] = variable_output_wrapper(getattr(chemicals, name),
-            __pint_wrapped_functions[name], val[0], val[1])
+    def __dir__():
+        return sorted(set(globals()).union(__all__))
+else:
+    for name in __unwrapped_objects:
+        globals()[name] = _wrap_chemicals_obj(name)
@@ -35,15 +35,18 @@ from chemicals.environment import (
     IPCC_2014_100YR_GWP,
     ODP,
     GWP_all_methods,
+    GWP_many,
     GWP_methods,
     IPCC_2007_GWPs,
     IPCC_2014_GWPs,
     ODP_all_methods,
     ODP_data,
+    ODP_many,
     ODP_methods,
     logP,
     logP_data_CRC,
     logP_data_Syrres,
+    logP_many,
     logP_methods,
 )
 
@@ -79,11 +82,29 @@ def test_GWP():
 
     with pytest.raises(Exception):
         GWP(CASRN='74-82-8', method='BADMETHOD')
+    with pytest.raises(ValueError):
+        GWP(CASRN='74-82-8', method='')
 
     assert GWP('7732-18-5', method=None) is None
     assert GWP_methods('14882353275-98-3') == []
     assert type(GWP(CASRN='74-82-8')) is float
 
+def test_methods_cached_lists_independent():
+    for f, CASRN in ((GWP_methods, '74-82-8'), (ODP_methods, '76-14-2'), (logP_methods, '110-54-3')):
+        methods = f(CASRN)
+        methods.append('BADMETHOD')
+        assert f(CASRN) == methods[:-1]
+        assert 'BADMETHOD' not in f(CASRN)
+
+def test_GWP_many():
+    CASRNs = ['74-82-8', '115-10-6', '7732-18-5', '75-69-4']
+    for method in (None,) + GWP_all_methods:
+        expect = [GWP(i, method=method) for i in CASRNs]
+        expect = [np.nan if v is None else v for v in expect]
+        assert_close1d(GWP_many(CASRNs, method=method), expect)
+    with pytest.raises(ValueError):
+        GWP_many(CASRNs, method='BADMETHOD')
+
 @pytest.mark.slow
 @pytest.mark.fuzz
 def test_GWP_all_values():
@@ -121,12 +142,23 @@ def test_logP():
 
     with pytest.raises(Exception):
         logP(CASRN='74-82-8', method='BADMETHOD')
+    with pytest.raises(ValueError):
+        logP(CASRN='67-56-1', method='')
 
     logP_available = logP_methods('110-54-3')
     assert logP_available == ['CRC', 'SYRRES']
 
     assert logP('1124321250-54-3') is None
 
+def test_logP_many():
+    CASRNs = ['67-56-1', '124-18-5', '7732-18-5', '100-66-3', '110-54-3', '1124321250-54-3']
+    for method in (None, 'CRC', 'SYRRES', 'WIKIDATA'):
+        expect = [logP(i, method=method) for i in CASRNs]
+        expect = [np.nan if v is None else v for v in expect]
+        assert_close1d(logP_many(CASRNs, method=method), expect)
+    with pytest.raises(ValueError):
+        logP_many(CASRNs, method='BADMETHOD')
+
 @pytest.mark.fuzz
 @pytest.mark.slow
 def test_logP_all_values():
@@ -157,11 +189,22 @@ def test_ODP():
 
     with pytest.raises(Exception):
         ODP(CASRN='148875-98-3', method='BADMETHOD')
+    with pytest.raises(ValueError):
+        ODP(CASRN='148875-98-3', method='')
 
     assert ODP(CASRN='14882353275-98-3') is None
 
     assert ODP_methods('14882353275-98-3') == []
 
+def test_ODP_many():
+    CASRNs = ODP_data.index.tolist() + ['7732-18-5']
+    for method in (None,) + ODP_all_methods[:-2]:
+        expect = [ODP(i, method=method) for i in CASRNs]
+        expect = [np.nan if v is None else v for v in expect]
+        assert_close1d(ODP_many(CASRNs, method=method), expect)
+    with pytest.raises(ValueError):
+        ODP_many(CASRNs, method='ODP2 string')
+
 @pytest.mark.slow
 @pytest.mark.fuzz
 def test_ODP_all_values():
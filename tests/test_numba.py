@@ -41,6 +41,7 @@ from chemicals import (
     Li,
     Lucas_gas,
     Rachford_Rice_flash_error,
+    Rachford_Rice_polynomial,
     Rachford_Rice_solution2,
     Rachford_Rice_solution_polynomial,
     Rachford_Rice_solutionN,
@@ -60,6 +61,7 @@ from chemicals import (
     zs_to_Vfs,
     zs_to_ws,
 )
+from chemicals.rachford_rice import Rachford_Rice_polynomial_6, _rr_binary, err_RR_poly_6
 
 try:
     import numba
@@ -536,6 +538,27 @@ def test_rachford_rice():
 
 
 
+@mark_as_numba
+def test_rachford_rice_residuals():
+    from chemicals.rachford_rice import Rachford_Rice_err, Rachford_Rice_err_fprime, Rachford_Rice_err_fprime2
+    n = 10
+    zs = np.array([0.5, 0.3, 0.2]*n)/n
+    Ks = np.array([1.685, 0.742, 0.532]*n)
+    K_minus_1 = Ks - 1.0
+    zs_k_minus_1 = zs*K_minus_1
+    zs_k_minus_1_2 = -zs_k_minus_1*K_minus_1
+    zs_k_minus_1_3 = -2.0*zs_k_minus_1_2*K_minus_1
+    args = (zs_k_minus_1.tolist(), zs_k_minus_1_2.tolist(), zs_k_minus_1_3.tolist(), K_minus_1.tolist())
+
+    assert_close(chemicals.numba.Rachford_Rice_flash_error(0.5, zs=zs, Ks=Ks),
+                 Rachford_Rice_flash_error(0.5, zs=zs.tolist(), Ks=Ks.tolist()), rtol=1e-13)
+    assert_close(chemicals.numba.rachford_rice.Rachford_Rice_err(0.5, zs_k_minus_1, K_minus_1),
+                 Rachford_Rice_err(0.5, args[0], args[3]), rtol=1e-13)
+    assert_close1d(chemicals.numba.rachford_rice.Rachford_Rice_err_fprime(0.5, zs_k_minus_1, zs_k_minus_1_2, K_minus_1),
+                   Rachford_Rice_err_fprime(0.5, args[0], args[1], args[3]), rtol=1e-13)
+    assert_close1d(chemicals.numba.rachford_rice.Rachford_Rice_err_fprime2(0.5, zs_k_minus_1, zs_k_minus_1_2, zs_k_minus_1_3, K_minus_1),
+                   Rachford_Rice_err_fprime2(0.5, *args), rtol=1e-13)
+
 @mark_as_numba
 def test_Rachford_Rice_solutionN():
     ns = [0.204322076984, 0.070970999150, 0.267194323384, 0.296291964579, 0.067046080882, 0.062489248292, 0.031685306730]
@@ -563,6 +586,15 @@ def test_Rachford_Rice_solution2():
     assert_close1d(z2, z2_new)
 
 
+@mark_as_numba
+def test_rr_binary():
+    for z1, z2, K1, K2 in [(0.4, 0.6, 2.0, 0.5), (0.4, 0.6, 1.000001, 0.999998), (0.0, 1.0, 2.0, 0.5)]:
+        VF_new, xs_new, ys_new = chemicals.numba.rachford_rice._rr_binary(z1, z2, K1, K2)
+        VF, xs, ys = _rr_binary(z1, z2, K1, K2)
+        assert_close(VF, VF_new, rtol=1e-15)
+        assert_close1d(xs, xs_new, rtol=1e-15)
+        assert_close1d(ys, ys_new, rtol=1e-15)
+
 @mark_as_numba
 def test_rachford_rice_polynomial():
     zs, Ks = [.4, .6], [2, .5]
@@ -596,7 +628,7 @@ def test_rachford_rice_polynomial():
     assert_close1d(xs, xs_new)
     assert_close1d(ys, ys_new)
 
-    # 6 and higher use generic routine
+    # 6 and higher solve the polynomial numerically
     zs = [0.05, 0.10, 0.15, 0.30, 0.30, 0.10]
     Ks = [6.0934, 2.3714, 1.3924, 1.1418, 0.6457, 0.5563]
     VF_new, xs_new, ys_new = chemicals.numba.Rachford_Rice_solution_polynomial(np.array(zs), np.array(Ks))
@@ -605,6 +637,20 @@ def test_rachford_rice_polynomial():
     assert_close1d(xs, xs_new)
     assert_close1d(ys, ys_new)
 
+    # Unrolled six component coefficients, and the generic routine above that
+    zs = [0.3727, 0.0772, 0.0275, 0.0071, 0.0017, 0.0028, 0.0011, 0.0015, 0.0333, 0.0320, 0.0608, 0.0571, 0.0538, 0.0509, 0.0483, 0.0460, 0.0439, 0.0420, 0.0403]
+    Ks = [7.11, 4.30, 3.96, 1.51, 1.20, 1.27, 1.16, 1.09, 0.86, 0.80, 0.73, 0.65, 0.58, 0.51, 0.45, 0.39, 0.35, 0.30, 0.26]
+    for N in (6, 7, 19):
+        poly_new = chemicals.numba.Rachford_Rice_polynomial(np.array(zs[:N]), np.array(Ks[:N]))
+        assert_close1d(poly_new, Rachford_Rice_polynomial(zs[:N], Ks[:N]), rtol=1e-12)
+
+    Cs = [Ki - 1.0 for Ki in Ks[:6]]
+    poly_new = chemicals.numba.Rachford_Rice_polynomial_6(np.array(zs[:6]), np.array(Cs))
+    poly = Rachford_Rice_polynomial_6(zs[:6], Cs)
+    assert_close1d(poly_new, poly, rtol=1e-13)
+    for VF in (-0.5, 0.0, 0.3, 1.2):
+        assert_close(chemicals.numba.err_RR_poly_6(VF, poly_new), err_RR_poly_6(VF, poly), rtol=1e-13)
+
 @mark_as_numba
 def test_fitting_jacobians():
     T, Tc, Pc, a, b, c, d = 100.0, 475.03, 2980000.0, -8.32915, 2.37044, -3.75113, -4.6033
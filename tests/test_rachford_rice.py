@@ -26,18 +26,22 @@ from random import randint, random, uniform
 
 import numpy as np
 import pytest
-from fluids.numerics import assert_close, assert_close1d, derivative, isclose, normalize
+from fluids.numerics import assert_close, assert_close1d, derivative, horner, normalize
 
 from chemicals import normalize
 from chemicals.exceptions import PhaseCountReducedError
 from chemicals.rachford_rice import (
     Li_Johns_Ahmadi_solution,
+    RRN_max_damping,
+    RRN_new_betas,
     Rachford_Rice_flash2_f_jac,
     Rachford_Rice_flash_error,
     Rachford_Rice_flashN_f_jac,
     Rachford_Rice_polynomial,
+    Rachford_Rice_polynomial_6,
     Rachford_Rice_solution,
     Rachford_Rice_solution2,
+    Rachford_Rice_solution_batch,
     Rachford_Rice_solution_binary_dd,
     Rachford_Rice_solution_Leibovici_Neoschil,
     Rachford_Rice_solution_Leibovici_Neoschil_dd,
@@ -47,6 +51,8 @@ from chemicals.rachford_rice import (
     Rachford_Rice_solution_polynomial,
     Rachford_Rice_solutionN,
     Rachford_Rice_valid_solution_naive,
+    _rr_binary,
+    err_RR_poly_6,
     flash_inner_loop,
     flash_inner_loop_methods,
 )
@@ -233,6 +239,65 @@ def test_Rachford_Rice_solution_Leibovici_Neoschil(func):
     flash_inner_loop(zs=[0.5, 0.3, 0.2], Ks=[1.685, 0.742, 0.532], method='Leibovici and Neoschil')
 
 
+def test_Rachford_Rice_solution_Leibovici_Neoschil_numpy():
+    from chemicals.rachford_rice import (
+        Rachford_Rice_err_fprime_Leibovici_Neoschil,
+        Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil,
+    )
+    args = ([0.3425, -0.0774, -0.0936], [-0.23461250000000003, -0.0199692, -0.0438048], [0.685, -0.258, -0.46799999999999997], 0.3384490610767984, 2.1367521367521367)
+    np_args = tuple(np.array(v) for v in args[:3]) + args[3:]
+    assert_close1d(Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil(1.0, *np_args),
+                   Rachford_Rice_err_fprime_Leibovici_Neoschil(1.0, *args), rtol=1e-13)
+
+    # Many components use the numpy kernel
+    zs = normalize([0.5, 0.3, 0.2]*20)
+    Ks = [1.685, 0.742, 0.532]*20
+    LF, VF, xs, ys = Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks)
+    assert type(xs) is list and type(ys) is list
+    assert_close(VF, 0.6907302627738544, rtol=1e-14)
+    assert_close1d(xs, [v/20 for v in [0.33940869696634357, 0.3650560590371706, 0.29553524399648584]*20], rtol=1e-13)
+    assert_close1d(ys, [v/20 for v in [0.5719036543882889, 0.27087159580558057, 0.1572247498061304]*20], rtol=1e-13)
+
+def test_Rachford_Rice_solution_Leibovici_Neoschil_dd_numpy():
+    from chemicals.rachford_rice import (
+        Rachford_Rice_err_fprime_Leibovici_Neoschil_dd,
+        Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil_dd,
+        Rachford_Rice_solution_Leibovici_Neoschil_dd,
+    )
+    args = ([0.3425, -0.0774, -0.0936], [1e-18, 0.0, -2e-18], [-0.23461250000000003, -0.0199692, -0.0438048], [0.0]*3,
+            [0.685, -0.258, -0.46799999999999997], [0.0]*3)
+    bounds = (-1.4598540145985401, 0.0, 2.1367521367521367, 0.0)
+    np_args = tuple(np.array(v) for v in args)
+    calc = Rachford_Rice_numpy_err_fprime_Leibovici_Neoschil_dd(0.3, 0.0, *(np_args + bounds))
+    expect = Rachford_Rice_err_fprime_Leibovici_Neoschil_dd(0.3, 0.0, *(args + bounds))
+    assert_close(calc[0] + calc[1], expect[0] + expect[1], rtol=1e-15)
+    assert_close(calc[2] + calc[3], expect[2] + expect[3], rtol=1e-15)
+
+    # Many components use the numpy kernel
+    zs = normalize([0.5, 0.3, 0.2]*30)
+    Ks = [1.685, 0.742, 0.532]*30
+    LF, VF, xs, ys = Rachford_Rice_solution_Leibovici_Neoschil_dd(zs, Ks)
+    assert type(xs) is list and type(ys) is list
+    assert_close(VF, 0.6907302627738544, rtol=1e-14)
+    assert_close1d(xs, [v/30 for v in [0.33940869696634357, 0.3650560590371706, 0.29553524399648584]*30], rtol=1e-13)
+
+def test_Rachford_Rice_solution_LN2_numpy():
+    from chemicals.rachford_rice import Rachford_Rice_err_LN2, Rachford_Rice_numpy_err_LN2
+    zs, cis_ys = [0.5, 0.3, 0.2], [-1.4598540145985401, 3.875968992248062, 2.1367521367521367]
+    args = (0.3, zs, cis_ys, 3.5966061513506768, -1.4598540145985401, 3)
+    np_args = (0.3, np.array(zs), np.array(cis_ys)) + args[3:]
+    assert_close1d(Rachford_Rice_numpy_err_LN2(*np_args), Rachford_Rice_err_LN2(*args), rtol=1e-13)
+
+    # Many components use the numpy kernel
+    zs = normalize([0.5, 0.3, 0.2]*20)
+    Ks = [1.685, 0.742, 0.532]*20
+    VF, xs, ys = Rachford_Rice_solution_LN2(zs, Ks)
+    assert type(xs) is list and type(ys) is list
+    assert_close(VF, 0.6907302627738544, rtol=1e-13)
+    assert_close1d(xs, [v/20 for v in [0.33940869696634357, 0.3650560590371706, 0.29553524399648584]*20], rtol=1e-13)
+    assert_close1d(ys, [v/20 for v in [0.5719036543882889, 0.27087159580558057, 0.1572247498061304]*20], rtol=1e-13)
+
+
 
 def test_RR_numpy():
     def Wilson_K_value(T, P, Tc, Pc, omega):
@@ -248,6 +313,10 @@ def test_RR_numpy():
     VF, xs, ys = Rachford_Rice_solution_numpy(zs, Ks)
     assert_close(VF, 1)
 
+    VF_arr, xs_arr, ys_arr = Rachford_Rice_solution_numpy(zs, Ks, return_ndarray=True)
+    assert type(xs_arr) is np.ndarray and type(ys_arr) is np.ndarray
+    assert VF_arr == VF
+    assert xs_arr.tolist() == xs and ys_arr.tolist() == ys
 
     # Check it raises the correct exception if bad K values are given
     with pytest.raises(PhaseCountReducedError):
@@ -259,6 +328,42 @@ def test_RR_numpy():
         ans = Rachford_Rice_solution_numpy(zs, Ks, guess=0.5)
 
 
+def test_Rachford_Rice_solution_batch():
+    rng = np.random.RandomState(0)
+    zs = rng.rand(200, 8)
+    zs[rng.rand(200, 8) < 0.1] = 0.0
+    zs /= zs.sum(axis=1)[:, None]
+    Ks = 10.0**rng.uniform(-3.0, 3.0, (200, 8))
+    # One row with every K above one has no solution
+    Ks[0] = [1.5, 2.0, 3.0, 1.1, 1.2, 4.0, 5.0, 6.0]
+
+    V_over_F, xs, ys = Rachford_Rice_solution_batch(zs, Ks)
+    assert V_over_F.shape == (200,) and xs.shape == ys.shape == (200, 8)
+    for i in range(200):
+        try:
+            VF_expect, xs_expect, ys_expect = Rachford_Rice_solution_LN2(zs[i].tolist(), Ks[i].tolist())
+        except PhaseCountReducedError:
+            assert np.isnan(V_over_F[i])
+            continue
+        assert_close(V_over_F[i], VF_expect, rtol=1e-11, atol=1e-13)
+        assert_close1d(xs[i], xs_expect, rtol=1e-9)
+        assert_close1d(ys[i], ys_expect, rtol=1e-9)
+
+    # Guesses inside the bounds are used and do not change the answer
+    V_over_F_guess, _, _ = Rachford_Rice_solution_batch(zs, Ks, guess=V_over_F*(1.0 + 1e-3))
+    assert_close1d(V_over_F_guess[1:], V_over_F[1:], rtol=1e-12)
+
+    # Rows not converged within maxiter are NaN rather than a partial answer
+    V_over_F_1, xs_1, ys_1 = Rachford_Rice_solution_batch(zs, Ks, maxiter=1)
+    assert np.isnan(V_over_F_1).all()
+    assert np.isnan(xs_1).all() and np.isnan(ys_1).all()
+    V_over_F_converged = Rachford_Rice_solution_batch([[0.5, 0.3, 0.2]], [[1.685, 0.742, 0.532]], guess=0.690730262773854, maxiter=1)[0]
+    assert_close(V_over_F_converged[0], 0.690730262773854, rtol=1e-14)
+
+    with pytest.raises(ValueError):
+        Rachford_Rice_solution_batch([0.5, 0.5], [2.0, 0.5])
+
+
 def test_Rachford_Rice_flash_error():
     err = Rachford_Rice_flash_error(0.5, zs=[0.5, 0.3, 0.2], Ks=[1.685, 0.742, 0.532])
     assert_close(err, 0.04406445591174976)
@@ -285,6 +390,72 @@ def test_Rachford_Rice_solution():
     Ks = [8392.392499558426, 12360.984782058651, 13065.127660554343, 13336.292668013915, 14828.275288641305, 15830.9627719128, 17261.101575196506, 18943.481861916727, 21232.279762917482, 23663.61696650799]
 #    flash_inner_loop(zs, Ks)
 
+def test_flash_inner_loop_analytical_binary():
+    for zs, Ks in working_exact_binarys:
+        LF_mp, VF_mp, xs_mp, ys_mp = Rachford_Rice_solution_mpmath(zs, Ks)
+        VF, xs, ys = flash_inner_loop(zs, Ks, method='Analytical')
+        assert_close(VF, VF_mp, rtol=1e-12)
+
+    # K values near 1 cancel badly in the expanded denominator
+    for zs, Ks in [([0.4, 0.6], [1.000001, 0.999998]), ([0.7, 0.3], [1.0 + 3e-9, 1.0 - 5e-10])]:
+        LF_mp, VF_mp, xs_mp, ys_mp = Rachford_Rice_solution_mpmath(zs, Ks)
+        VF, xs, ys = flash_inner_loop(zs, Ks, method='Analytical')
+        assert_close(VF, VF_mp, rtol=1e-12)
+        assert_close1d(xs, [float(v) for v in xs_mp], rtol=1e-12)
+        assert_close1d(ys, [float(v) for v in ys_mp], rtol=1e-12)
+
+def test_rr_binary():
+    for zs, Ks in [([0.4, 0.6], [1.000001, 0.999998]), ([0.7, 0.3], [1.0 + 3e-9, 1.0 - 5e-10]), ([0.4, 0.6], [2.0, 0.5])]:
+        LF_mp, VF_mp, xs_mp, ys_mp = Rachford_Rice_solution_mpmath(zs, Ks)
+        VF, xs, ys = _rr_binary(zs[0], zs[1], Ks[0], Ks[1])
+        assert_close(VF, VF_mp, rtol=1e-12)
+        assert_close1d(xs, [float(v) for v in xs_mp], rtol=1e-12)
+        assert_close1d(ys, [float(v) for v in ys_mp], rtol=1e-12)
+
+    # A component with no feed has no composition
+    VF, xs, ys = _rr_binary(0.0, 1.0, 2.0, 0.5)
+    assert xs[0] == 0.0 and ys[0] == 0.0
+
+    with pytest.raises(ZeroDivisionError):
+        _rr_binary(0.4, 0.6, 1.0, 0.5)
+
+def test_Rachford_Rice_solution_closed_form():
+    # Two and three components are solved directly, without iterating
+    points = working_exact_binarys + [([0.5, 0.3, 0.2], [1.685, 0.742, 0.532]),
+                                      ([0.1, 0.2, 0.7], [4.2, 1.75, 0.34]),
+                                      ([0.3236492620816329, 0.6641935438362395, 0.012157194082127343],
+                                       [0.9999999836883505, 1.0000000096397859, 0.9999999075885792])]
+    for zs, Ks in points:
+        LF_mp, VF_mp, xs_mp, ys_mp = Rachford_Rice_solution_mpmath(zs, Ks)
+        VF, xs, ys = Rachford_Rice_solution(zs, Ks)
+        assert_close(VF, VF_mp, rtol=1e-10)
+        if len(zs) == 2:
+            LF, VF, xs, ys = Rachford_Rice_solution_Leibovici_Neoschil(zs, Ks)
+            assert_close(VF, VF_mp, rtol=1e-12)
+            assert_close(LF, LF_mp, rtol=1e-12)
+            assert_close1d(xs, [float(v) for v in xs_mp], rtol=1e-12)
+            assert_close1d(ys, [float(v) for v in ys_mp], rtol=1e-12)
+
+    # No feed of a component means the quadratic has a spurious root
+    V_over_F, xs, ys = Rachford_Rice_solution([0.4, 0.6, 0.0], [2.0, 0.5, 0.9])
+    assert_close(V_over_F, Rachford_Rice_solution([0.4, 0.6], [2.0, 0.5])[0])
+
+
+def test_flash_inner_loop_wide_K_range():
+    # By default, K values spanning more than three orders of magnitude are solved with LN2
+    zs = [0.12271239538014186, 0.016688392995752983, 0.10159924594093289, 0.09558937443692589, 0.07681673024260191, 0.020952564919018975, 0.03419513365827097, 0.020404626878095976, 0.05603680095552694, 0.0814155255495049, 0.0860394610110099, 0.0011758779097489987, 0.07729388079415092, 0.03973733129506296, 0.054307478069036935, 0.11346214799601287, 0.0015730319682039982]
+    Ks = [1.25451331438062e-06, 0.001613958518631, 3.28349604381203e-06, 0.000293650613823, 0.002897518955679, 0.042201225711135, 0.003883347612667, 0.082444954682835, 0.00021676982537, 0.001328405933072, 0.00121260154771, 0.10245056772688, 0.00073719871203, 0.106855150338562, 0.001103829875176, 0.00068867110979, 1.0114133901421]
+    assert flash_inner_loop(zs, Ks) == Rachford_Rice_solution_LN2(zs, Ks)
+    assert_close(flash_inner_loop(zs, Ks)[0], Rachford_Rice_solution_mpmath(zs, Ks)[1], rtol=1e-12)
+    assert_close(Rachford_Rice_solution(zs, Ks)[0], Rachford_Rice_solution_mpmath(zs, Ks)[1], rtol=1e-7)
+
+    # An explicitly selected method is always used
+    assert flash_inner_loop(zs, Ks, method='Rachford-Rice (Secant)') == Rachford_Rice_solution(zs, Ks)
+
+    # A K of exactly one cannot be transformed; the secant is used instead
+    V_over_F, xs, ys = flash_inner_loop([0.3, 0.3, 0.2, 0.2], [1e-3, 1.0, 0.5, 10.0])
+    assert_close(V_over_F, Rachford_Rice_solution_mpmath([0.3, 0.3, 0.2, 0.2], [1e-3, 1.0, 0.5, 10.0])[1], rtol=1e-7)
+
 
 def test_Rachford_Rice_solution_LN2_points():
     zs = [0.035913905617760956, 0.10962044346783988, 0.11092173647050588, 0.11473577098674388, 0.0846055704821889, 0.04601885708379495, 0.06043783335409393, 0.05226065072914894, 0.10575781537365889, 0.00927507714750399, 0.02582436420968297, 0.0031685331797319965, 0.023456539423053972, 0.0012337948690829988, 0.04598781987494095, 0.015665256791958983, 0.039761683740807956, 0.10980250545370088, 0.005551841743798994]
@@ -449,6 +620,16 @@ def test_flash_inner_loop():
     # case with a guess
     flash_inner_loop(zs=[0.5, 0.3, 0.2], Ks=[1.685, 0.742, 0.532], guess=.7)
 
+    # Array inputs are solved the same as lists
+    zs = [0.1, 0.2, 0.3, 0.3, .01, 0.09]
+    Ks = [4.2, 1.75, 0.74, 0.34, .01, 1.3]
+    for method in flash_inner_loop_methods(len(zs)):
+        V_over_F, xs, ys = flash_inner_loop(zs=zs, Ks=Ks, method=method)
+        V_over_F_arr, xs_arr, ys_arr = flash_inner_loop(zs=np.array(zs), Ks=np.array(Ks), method=method)
+        assert V_over_F_arr == V_over_F
+        assert_close1d(xs_arr, xs, rtol=0)
+        assert_close1d(ys_arr, ys, rtol=0)
+
     # Seems like a bad idea
     # TODO - handle with the `check` parameter
     # Zero composition - technically this is incorrect? But quite useful in saturation calcs
@@ -750,7 +931,8 @@ def test_RR_3_component_analytical_killers():
     Ks = [1.0003745026538315, 0.9983665794975959, 1.0010499948551157]
     V_over_F, xs, ys = flash_inner_loop(zs, Ks, method='Analytical')
     V_over_F_good, xs_good, ys_good = Rachford_Rice_solution(zs, Ks)
-    assert not isclose(V_over_F, V_over_F_good)
+    # The quadratic is solved without cancellation, so this case is now accurate
+    assert_close(V_over_F, V_over_F_good, rtol=1e-12)
 
 def test_RR_9_guess_outside_bounds():
     zs = [0.019940159581097128, 0.0029910239371645692, 9.970079790548564e-07, 0.6480551863856566, 0.12961103727713133, 0.08973071811493706, 0.04985039895274282, 0.029910239371645688, 0.029910239371645688]
@@ -808,10 +990,25 @@ def test_Rachford_Rice_solution2():
     fs_expect = [0.22327453005006953, -0.10530391302991113]
     jac_expect = [[-0.7622803760231517, -0.539733935411029], [-0.539733935411029, -0.86848106463838]]
 
+    Ksm1_lists = [[K - 1.0 for K in Ks_y], [K - 1.0 for K in Ks_z]]
+    zsKsm1_lists = [[zi*Km1 for zi, Km1 in zip(zs, row)] for row in Ksm1_lists]
     for func in (Rachford_Rice_flash2_f_jac, Rachford_Rice_flashN_f_jac):
         f, jac = func(betas, zs, [Ks_y, Ks_z])
         assert_close1d(f, fs_expect)
         assert_close1d(jac, jac_expect)
+        assert func(betas, zs, [Ks_y, Ks_z], Ksm1_lists, zsKsm1_lists) == (f, jac)
+
+    from chemicals.rachford_rice import Rachford_Rice_numpy_flashN_f_jac
+    Ksm1 = np.array([Ks_y, Ks_z]) - 1.0
+    f, jac = Rachford_Rice_numpy_flashN_f_jac(betas, zs, [Ks_y, Ks_z], Ksm1, np.array(zs)*Ksm1)
+    assert_close1d(f, fs_expect)
+    assert_close1d(jac, jac_expect)
+
+    from chemicals.rachford_rice import Rachford_Rice_numpy_valid_solution_naive
+    for betas_test in ([0.1, 0.6], [0.9, 0.9], [-0.5, 0.2], [1.2, -0.1]):
+        for limit_betas in (False, True):
+            assert (Rachford_Rice_valid_solution_naive(zs, betas_test, [Ks_y, Ks_z], limit_betas=limit_betas)
+                    == Rachford_Rice_numpy_valid_solution_naive(betas_test, Ksm1, limit_betas=limit_betas))
 
     ans = Rachford_Rice_solution2(zs, Ks_y, Ks_z, beta_y=.1, beta_z=.6)
     xs_expect = [0.1712804659711611, 0.08150738616425436, 0.1393433949193188, 0.20945175387703213, 0.15668977784027893, 0.22650123851718007, 0.015225982711774586]
@@ -943,6 +1140,33 @@ def test_Rachford_Rice_solutionN_vs_flash_inner_loop():
     assert_close1d(xs_1d, xs)
     assert_close1d(ys, ys_1d)
 
+    # Many components build the compositions with numpy
+    zs, Ks = normalize(zs*12), Ks*12
+    betas, comps = Rachford_Rice_solutionN(zs, Ks=[Ks], betas=[.5])
+    assert all(type(comp) is list for comp in comps)
+    beta_y_1d, xs_1d, ys_1d = flash_inner_loop(zs, Ks)
+    assert_close(betas[0], beta_y_1d, rtol=1e-12)
+    assert_close1d(comps[1], xs_1d, rtol=1e-12)
+    assert_close1d(comps[0], ys_1d, rtol=1e-12)
+
+
+def test_RRN_max_damping():
+    ns = [0.204322076984, 0.070970999150, 0.267194323384, 0.296291964579, 0.067046080882, 0.062489248292, 0.031685306730]
+    Ks_y = [1.23466988745, 0.89727701141, 2.29525708098, 1.58954899888, 0.23349348597, 0.02038108640, 1.40715641002]
+    Ks_z = [1.52713341421, 0.02456487977, 1.46348240453, 1.16090546194, 0.24166289908, 0.14815282572, 14.3128010831]
+    Ks = [Ks_y, Ks_z]
+    betas, d_betas = [0.1, 0.6], [-20.0, 15.0]
+    damping_max = RRN_max_damping(betas, d_betas, Ks)
+    assert 0.0 < damping_max < 1.0
+    assert Rachford_Rice_valid_solution_naive(ns, [b + d*damping_max*(1.0 - 1e-12) for b, d in zip(betas, d_betas)], Ks)
+    assert not Rachford_Rice_valid_solution_naive(ns, [b + d*damping_max*(1.0 + 1e-9) for b, d in zip(betas, d_betas)], Ks)
+
+    # The step taken is the largest halving of the damping within the limit
+    betas_test = RRN_new_betas(betas, d_betas, 1.0, ns, Ks)
+    damping = (betas_test[0] - betas[0])/d_betas[0]
+    assert damping <= damping_max < 2.0*damping
+
+    assert RRN_max_damping(betas, [0.0, 0.0], Ks) == 1e100
 
 def test_Rachford_Rice_solutionN():
     # 5 phase example!
@@ -1038,12 +1262,15 @@ def test_Rachford_Rice_polynomial():
     coeffs_5 = [1.0, 3.926393887728915, -32.1738043292604, 45.82179827480925, -15.828236126660224]
     assert_close1d(coeffs_5, poly)
 
-    # 6 and higher use generic routine
+    # 6 has an unrolled routine; 7 and higher use the generic one
     zs = [0.05, 0.10, 0.15, 0.30, 0.30, 0.10]
     Ks = [6.0934, 2.3714, 1.3924, 1.1418, 0.6457, 0.5563]
     coeffs_6 = [1.0, 3.9413425113979077, -9.44556472337601, -18.952349132451488, 9.04210538319183, 5.606427780744831]
     poly = Rachford_Rice_polynomial(zs, Ks)
     assert_close1d(coeffs_6, poly)
+    assert_close1d(coeffs_6, Rachford_Rice_polynomial_6(zs, [Ki - 1.0 for Ki in Ks]), rtol=1e-13)
+    for VF in (-0.5, 0.0, 0.3, 1.2):
+        assert_close(err_RR_poly_6(VF, poly), horner(poly, VF), rtol=1e-14)
 
     Ks = [0.9, 2.7, 0.38, 0.098, 0.038, 0.024, 0.075]
     zs = [0.0112, 0.8957, 0.0526, 0.0197, 0.0068, 0.0047, 0.0093]
@@ -1058,10 +1285,33 @@ def test_Rachford_Rice_polynomial():
     assert_close1d(coeffs_8, poly)
 
 
-@pytest.mark.slow
+def test_Rachford_Rice_polynomial_6():
+    # Compare the unrolled coefficients against expanding
+    # sum_i z_i C_i prod_{j != i} (1 + alpha C_j) directly
+    zs_all = [[0.05, 0.10, 0.15, 0.30, 0.30, 0.10],
+              [0.3727, 0.0772, 0.0275, 0.0071, 0.0017, 0.5138],
+              [1e-4, 0.2, 0.3, 0.2999, 0.1, 0.1]]
+    Ks_all = [[6.0934, 2.3714, 1.3924, 1.1418, 0.6457, 0.5563],
+              [7.11, 4.30, 3.96, 1.51, 0.45, 0.26],
+              [1e3, 30.0, 1.05, 0.95, 1e-2, 1e-5]]
+    for zs, Ks in zip(zs_all, Ks_all):
+        Cs = [Ki - 1.0 for Ki in Ks]
+        expect = np.zeros(6)
+        for i in range(6):
+            term = np.array([zs[i]*Cs[i]])
+            for j in range(6):
+                if j != i:
+                    term = np.polymul(term, [Cs[j], 1.0])
+            expect = np.polyadd(expect, term)
+        expect = expect/expect[0]
+        poly = Rachford_Rice_polynomial_6(zs, Cs)
+        assert_close1d(poly, expect, rtol=1e-12)
+        for VF in (-0.5, 0.0, 0.3, 1.2):
+            assert_close(err_RR_poly_6(VF, poly), horner(poly, VF), rtol=1e-13)
+
+
 def test_Rachford_Rice_polynomial_large():
-    # Way past practical point
-    # 19 takes ~1 sec
+    # Way past practical point for solving the polynomial
     zs = [0.3727, 0.0772, 0.0275, 0.0071, 0.0017, 0.0028, 0.0011, 0.0015, 0.0333, 0.0320, 0.0608, 0.0571, 0.0538, 0.0509, 0.0483, 0.0460, 0.0439, 0.0420, 0.0403]
     Ks = [7.11, 4.30, 3.96, 1.51, 1.20, 1.27, 1.16, 1.09, 0.86, 0.80, 0.73, 0.65, 0.58, 0.51, 0.45, 0.39, 0.35, 0.30, 0.26]
     coeffs_19 = [1.0, -0.8578819552817947, -157.7870481947649, 547.7859890170784, 6926.565858999385,
@@ -1073,8 +1323,6 @@ def test_Rachford_Rice_polynomial_large():
     poly = Rachford_Rice_polynomial(zs, Ks)
     assert_close1d(coeffs_19, poly)
 
-    # doubling 19 runs out of ram.
-
 
 def test_Rachford_Rice_polynomial_solution_VFs():
     zs = [0.2, 0.3, 0.4, 0.05, 0.05]
@@ -1082,6 +1330,12 @@ def test_Rachford_Rice_polynomial_solution_VFs():
     VF =  Rachford_Rice_solution_polynomial(zs, Ks)[0]
     assert_close(VF, 0.5247206476383832)
 
+    # Secant stalls at a point which is not a root; must fall back to brenth
+    zs = [0.10410103710248599, 0.08795896278426468, 0.032975044810925384, 0.0015277491805533335, 0.004507041367470242, 0.05214315834917083, 0.13482592459625958, 0.07529419612334912, 0.10142654707334631, 0.0507886310038967, 0.18218129932779611, 0.1722704082804817]
+    Ks = [0.19591052347148738, 0.4496728990790739, 0.06548741175060405, 0.4851484201779729, 0.16758528659981908, 4.784939551600055, 0.27423511099739445, 3.611278238147061, 0.03798826922106447, 4.1716726118603775, 2.5821887014070786, 0.23508906861114415]
+    VF = Rachford_Rice_solution_polynomial(zs, Ks)[0]
+    assert_close(VF, 0.1804760528674594, rtol=1e-12)
+
 
 def test_check_flash_inner():
     VF, xs, ys = flash_inner_loop([0.2, 0.0, 0.8], [0.971209295156525, 0.7996504795406192, 1.1403683517535024], check=True)
@@ -55,6 +55,11 @@ def test_Tt():
     with pytest.raises(Exception):
         Tt('74-82-8', method='BADMETHOD')
 
+    # Each method is looked up on its own; WEBBOOK is indexed by integer CASRN
+    for method in m[:-1]:
+        assert type(Tt('7439-90-9', method=method)) is float
+    assert Tt('not-a-CAS', method='WEBBOOK') is None
+
 
 @pytest.mark.slow
 def test_Tt_fuzz():
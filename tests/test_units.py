@@ -20,6 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+import pytest
 from fluids.numerics import assert_close
 
 from chemicals.units import Lastovka_solid_integral_over_T, LHV_from_HHV, Rackett_fit, speed_of_sound, u
@@ -61,3 +62,14 @@ def test_Rackett_fit_variable_units():
     assert_pint_allclose(Vm, 0.001745205199588548, {'[length]': 3, '[mass]': -1})
 
 
+
+def test_wrapped_on_access():
+    import chemicals.units
+    assert 'Watson' in chemicals.units.__all__
+    Hvap = chemicals.units.Watson(320*u.K, 43908*u.J/u.mol, 300*u.K, 647.14*u.K)
+    assert_pint_allclose(Hvap, 42928.990094915454, {'[length]': 2, '[mass]': 1, '[substance]': -1, '[time]': -2})
+    # The wrapper is only built once
+    assert chemicals.units.Watson is chemicals.units.Watson
+
+    with pytest.raises(AttributeError):
+        chemicals.units.not_a_chemicals_function